@@ -2,10 +2,14 @@ import argparse
 
 from bridge.cli.db import open_database_shell
 from bridge.cli.init import initialize
+from bridge.cli.pull import pull
 from bridge.cli.redis import open_redis_shell
+from bridge.cli.status import status
 from bridge.cli.stop import stop
+from bridge.cli.up import up
 from bridge.config import get_config
 from bridge.framework import Framework
+from bridge.platform.redis import REDIS_ROLE_DB_OFFSETS
 
 
 def detect_framework() -> Framework:
@@ -20,9 +24,22 @@ def main():
     parser.add_argument("--version", action="version", version="%(prog)s 0.1.0")
     subparsers = parser.add_subparsers(dest="command")
 
+    # Parser for 'up'
+    subparsers.add_parser(
+        "up", help="Start all local services in the background, outside of settings"
+    )
+
+    # Parser for 'status'
+    subparsers.add_parser("status", help="Show the local services and their ports")
+
     # Parser for 'stop'
     subparsers.add_parser("stop", help="Stop all running local services")
 
+    # Parser for 'pull'
+    subparsers.add_parser(
+        "pull", help="Pull the images of all local services ahead of time"
+    )
+
     # Parser for 'init' command
     init_parser = subparsers.add_parser(
         "init", help="Initialize configuration for a given platform (Render, Heroku)"
@@ -41,15 +58,29 @@ def main():
     # Parser for redis
     redis_parser = subparsers.add_parser("redis", help="Interact with Redis")
     redis_subparsers = redis_parser.add_subparsers(dest="redis_command")
-    redis_subparsers.add_parser("shell", help="Open a Redis shell (redis-cli)")
+    redis_shell_parser = redis_subparsers.add_parser(
+        "shell", help="Open a Redis shell (redis-cli)"
+    )
+    redis_shell_parser.add_argument(
+        "--role",
+        choices=list(REDIS_ROLE_DB_OFFSETS),
+        default="broker",
+        help="Open the logical database used for this role",
+    )
 
     # Parse the arguments
     args = parser.parse_args()
     framework = detect_framework()
     bridge_config = get_config()
 
-    if args.command == "stop":
+    if args.command == "up":
+        up(framework=framework, bridge_config=bridge_config)
+    elif args.command == "status":
+        status(bridge_config)
+    elif args.command == "stop":
         stop()
+    elif args.command == "pull":
+        pull(bridge_config)
     elif args.command == "init":
         initialize(
             framework=framework,
@@ -63,7 +94,7 @@ def main():
             db_parser.print_help()
     elif args.command == "redis":
         if args.redis_command == "shell":
-            open_redis_shell()
+            open_redis_shell(role=args.role)
         else:
             redis_parser.print_help()
     else:
@@ -1,10 +1,15 @@
 import docker
 
-from bridge.service.postgres import PostgresService
+from bridge.config import get_config
+from bridge.service.postgres import PostgresConfig, PostgresService
 
 
 def open_database_shell():
     client = docker.from_env()
-    postgres_service = PostgresService(client=client)
+    bridge_config = get_config()
+    config = PostgresConfig.from_database_config(
+        bridge_config.postgres, bridge_config.image_variant
+    )
+    postgres_service = PostgresService(client=client, config=config)
     postgres_service.start()
     postgres_service.shell()
@@ -5,7 +5,7 @@ from importlib.util import find_spec
 from pathlib import Path
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from rich.prompt import Confirm
 
 from bridge.cli.errors import ActionCancelledError
@@ -18,9 +18,16 @@ from bridge.cli.init.templates import (
     start_worker_sh_template,
 )
 from bridge.cli.init.templates.deploy_to_render_button import button_exists_in_content
-from bridge.config import BridgeConfig
+from bridge.config import (
+    DEFAULT_REMOTE_CONCURRENCY,
+    BridgeConfig,
+    DatabaseConfig,
+    RedisServerConfig,
+    WorkerConfig,
+)
 from bridge.console import console, log_warning
 from bridge.framework import Framework
+from bridge.service.celery_profiles import uses_msgpack
 from bridge.utils.filesystem import (
     resolve_dot_bridge,
     resolve_project_dir,
@@ -109,12 +116,34 @@ class RenderPlatformInitConfig(BaseModel):
     bridge_path: str
     enable_postgres: bool = True
     enable_worker: bool = True
+    enable_cache: bool = False
+    postgres: DatabaseConfig = Field(default_factory=DatabaseConfig)
+    worker: WorkerConfig = Field(default_factory=WorkerConfig)
+    redis: RedisServerConfig = Field(default_factory=RedisServerConfig)
     django_config: Optional[DjangoConfig] = None
 
     @property
     def script_dir(self) -> str:
         return f"bridge-{self.framework.value}-render"
 
+    @property
+    def extra_dependencies(self) -> list[str]:
+        """Packages needed on Render for the configured options."""
+        dependencies = []
+        if self.enable_postgres and self.postgres.pooling == "pool":
+            dependencies.append("psycopg-pool")
+        if self.enable_worker and self.worker.result_backend == "postgres":
+            # Celery stores results in Postgres through SQLAlchemy
+            dependencies.append("sqlalchemy")
+        if (
+            self.enable_worker
+            and self.worker.profile is not None
+            and uses_msgpack(self.worker.profile)
+        ):
+            # Otherwise the profile falls back to JSON
+            dependencies.append("msgpack")
+        return dependencies
+
 
 def build_render_init_config(
     framework: Framework, bridge_config: BridgeConfig
@@ -131,6 +160,10 @@ def build_render_init_config(
         bridge_path=str(bridge_path),
         enable_postgres=bridge_config.enable_postgres,
         enable_worker=bridge_config.enable_worker,
+        enable_cache=bridge_config.enable_cache,
+        postgres=bridge_config.postgres,
+        worker=bridge_config.worker,
+        redis=bridge_config.redis,
     )
 
     # Provide framework-specific configuration
@@ -177,7 +210,9 @@ class BuildSh(TemplatedFile):
 
     @classmethod
     def build(cls, config: RenderPlatformInitConfig) -> str:
-        return build_sh_template(framework=config.framework)
+        return build_sh_template(
+            framework=config.framework, extra_dependencies=config.extra_dependencies
+        )
 
 
 class BuildWorkerSh(TemplatedFile):
@@ -187,7 +222,10 @@ class BuildWorkerSh(TemplatedFile):
     @classmethod
     def build(cls, config: RenderPlatformInitConfig) -> str:
         if config.enable_worker:
-            return build_worker_sh_template(framework=config.framework)
+            return build_worker_sh_template(
+                framework=config.framework,
+                extra_dependencies=config.extra_dependencies,
+            )
         return ""
 
 
@@ -207,7 +245,9 @@ class StartWorkerSh(TemplatedFile):
     @classmethod
     def build(cls, config: RenderPlatformInitConfig) -> str:
         if config.enable_worker:
-            return start_worker_sh_template(framework=config.framework)
+            return start_worker_sh_template(
+                framework=config.framework, worker_config=config.worker
+            )
         return ""
 
 
@@ -223,6 +263,12 @@ class RenderYaml(TemplatedFile):
             database_name=f"{config.project_name}_db",
             enable_postgres=config.enable_postgres,
             enable_worker=config.enable_worker,
+            enable_cache=config.enable_cache,
+            enable_pgbouncer=config.postgres.pgbouncer,
+            pgbouncer_pool_size=config.postgres.pgbouncer_pool_size,
+            pgbouncer_max_client_conn=config.postgres.pgbouncer_max_client_conn,
+            redis_maxmemory_policy=config.redis.maxmemory_policy,
+            task_concurrency=config.worker.concurrency or DEFAULT_REMOTE_CONCURRENCY,
             django_settings_module=config.django_config.settings_module
             if config.django_config
             else "",
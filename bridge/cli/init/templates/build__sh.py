@@ -1,3 +1,5 @@
+from typing import Sequence
+
 from bridge.framework.base import Framework
 
 template = """#!/usr/bin/env bash
@@ -12,7 +14,7 @@ INSTALL_DEPS_SCRIPT="$DIR/install_deps.py"
 python "$INSTALL_DEPS_SCRIPT"
 
 # Install additional dependencies
-pip install gunicorn uvicorn psycopg-binary whitenoise[brotli]
+pip install gunicorn uvicorn psycopg-binary whitenoise[brotli]{extra_dependencies}
 
 # Collect static asset files
 python manage.py collectstatic --no-input
@@ -22,9 +24,13 @@ python manage.py migrate
 """
 
 
-def build_sh_template(framework: Framework) -> str:
+def build_sh_template(
+    framework: Framework, extra_dependencies: Sequence[str] = ()
+) -> str:
     if framework != Framework.DJANGO:
         raise NotImplementedError(
             f"Unsupported framework for Render platform: {framework}"
         )
-    return template.format()
+    return template.format(
+        extra_dependencies="".join(f" {package}" for package in extra_dependencies)
+    )
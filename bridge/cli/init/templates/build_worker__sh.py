@@ -1,3 +1,5 @@
+from typing import Sequence
+
 from bridge.framework.base import Framework
 
 template = """#!/usr/bin/env bash
@@ -8,13 +10,17 @@ set -o errexit
 pip install -r requirements.txt
 
 # Install additional dependencies
-pip install psycopg-binary
+pip install psycopg-binary{extra_dependencies}
 """
 
 
-def build_worker_sh_template(framework: Framework) -> str:
+def build_worker_sh_template(
+    framework: Framework, extra_dependencies: Sequence[str] = ()
+) -> str:
     if framework != Framework.DJANGO:
         raise NotImplementedError(
             f"Unsupported framework for Render platform: {framework}"
         )
-    return template.format()
+    return template.format(
+        extra_dependencies="".join(f" {package}" for package in extra_dependencies)
+    )
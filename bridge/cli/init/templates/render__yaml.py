@@ -1,4 +1,8 @@
+from typing import Optional
+
+from bridge.config import DEFAULT_REMOTE_CONCURRENCY
 from bridge.framework.base import Framework
+from bridge.platform.postgres import PGBOUNCER_IMAGE
 from bridge.utils.sanitize import sanitize_postgresql_identifier
 
 postgres_template = """
@@ -14,12 +18,43 @@ postgres_app_env_template = """      - key: DATABASE_URL
           name: {service_name}-db
           property: connectionString"""
 
+# PgBouncer in transaction pooling mode, between the app and the database
+pgbouncer_template = """
+  - type: pserv
+    name: {service_name}-pgbouncer
+    runtime: image
+    image:
+      url: docker.io/{pgbouncer_image}
+    plan: starter
+    envVars:
+      - key: DATABASE_URL
+        fromDatabase:
+          name: {service_name}-db
+          property: connectionString
+      - key: POOL_MODE
+        value: transaction
+      - key: AUTH_TYPE
+        value: scram-sha-256
+      - key: DEFAULT_POOL_SIZE
+        value: {pool_size}
+      - key: MAX_CLIENT_CONN
+        value: {max_client_conn}"""
 
-worker_template = """
+pgbouncer_app_env_template = """
+      - key: PGBOUNCER_HOSTPORT
+        fromService:
+          name: {service_name}-pgbouncer
+          type: pserv
+          property: hostport"""
+
+
+redis_template = """
   - type: redis
     name: {service_name}-redis
     plan: free
-    ipAllowList: []
+    ipAllowList: []{maxmemory_policy}"""
+
+worker_template = """
   - type: worker
     name: {service_name}-worker
     runtime: python
@@ -33,13 +68,10 @@ worker_template = """
       - key: SECRET_KEY
         generateValue: true
       - key: TASK_CONCURRENCY
-        value: 4
+        value: {task_concurrency}
       - key: DEBUG
         value: "False"
-      - key: DATABASE_URL
-        fromDatabase:
-          name: {service_name}-db
-          property: connectionString
+{postgres_worker_env}
       - key: REDIS_URL
         fromService:
           name: {service_name}-redis
@@ -47,7 +79,7 @@ worker_template = """
           property: connectionString
 """
 
-worker_app_env_template = """      - key: REDIS_URL
+redis_app_env_template = """      - key: REDIS_URL
         fromService:
           name: {service_name}-redis
           type: redis
@@ -71,8 +103,8 @@ template = """services:
       - key: DEBUG
         value: "False"
 {postgres_app_env}
-{worker_app_env}
-{worker_service}
+{redis_app_env}
+{redis_service}{pgbouncer_service}{worker_service}
 {postgres_service}
 """
 
@@ -83,9 +115,15 @@ def render_yaml_template(
     service_name: str,
     enable_postgres: bool = True,
     enable_worker: bool = True,
+    enable_cache: bool = False,
+    enable_pgbouncer: bool = False,
+    pgbouncer_pool_size: int = 20,
+    pgbouncer_max_client_conn: int = 1000,
+    redis_maxmemory_policy: Optional[str] = None,
     database_name: str = "",
     database_user: str = "",
     django_settings_module: str = "",
+    task_concurrency: int = DEFAULT_REMOTE_CONCURRENCY,
 ) -> str:
     # TODO: use a real templating engine
     if framework != Framework.DJANGO:
@@ -112,23 +150,53 @@ def render_yaml_template(
         postgres_service = ""
         postgres_app_env = ""
 
+    if enable_postgres and enable_pgbouncer:
+        pgbouncer_service = pgbouncer_template.format(
+            service_name=service_name,
+            pgbouncer_image=PGBOUNCER_IMAGE,
+            pool_size=pgbouncer_pool_size,
+            max_client_conn=pgbouncer_max_client_conn,
+        )
+        # The app and worker connect through PgBouncer, see configure_postgres
+        postgres_app_env += pgbouncer_app_env_template.format(service_name=service_name)
+    else:
+        pgbouncer_service = ""
+
     if enable_worker:
         worker_service = worker_template.format(
             service_name=service_name,
+            # The worker reaches the database for tasks, and for results when
+            # they are stored in Postgres
+            postgres_worker_env=postgres_app_env,
             script_dir=script_dir,
             django_settings_module=django_settings_module,
+            task_concurrency=task_concurrency,
         )
-        worker_app_env = worker_app_env_template.format(service_name=service_name)
     else:
         worker_service = ""
-        worker_app_env = ""
+
+    # Redis is the worker's broker, and backs the cache
+    if enable_worker or enable_cache:
+        redis_service = redis_template.format(
+            service_name=service_name,
+            # Render defaults to allkeys-lru, keep it in line with the local server
+            maxmemory_policy=f"\n    maxmemoryPolicy: {redis_maxmemory_policy}"
+            if redis_maxmemory_policy
+            else "",
+        )
+        redis_app_env = redis_app_env_template.format(service_name=service_name)
+    else:
+        redis_service = ""
+        redis_app_env = ""
 
     return (
         template.format(
             script_dir=script_dir,
             service_name=service_name,
             postgres_app_env=postgres_app_env,
-            worker_app_env=worker_app_env,
+            redis_app_env=redis_app_env,
+            redis_service=redis_service,
+            pgbouncer_service=pgbouncer_service,
             worker_service=worker_service,
             postgres_service=postgres_service,
         ).rstrip()
@@ -1,13 +1,24 @@
+from typing import Optional
+
+from bridge.config import DEFAULT_REMOTE_CONCURRENCY, WorkerConfig
 from bridge.framework.base import Framework
 
 template = """#!/usr/bin/env bash
-celery -A bridge.service.django_celery worker -l INFO --concurrency="${{TASK_CONCURRENCY:-4}}"
+celery -A bridge.service.django_celery worker -l INFO {worker_args}
 """
 
 
-def start_worker_sh_template(framework: Framework) -> str:
+def start_worker_sh_template(
+    framework: Framework, worker_config: Optional[WorkerConfig] = None
+) -> str:
     if framework != Framework.DJANGO:
         raise NotImplementedError(
             f"Unsupported framework for Render platform: {framework}"
         )
-    return template.format()
+    worker_config = worker_config or WorkerConfig()
+    # TASK_CONCURRENCY (set in render.yaml) can still be changed from the Render dashboard
+    default_concurrency = worker_config.concurrency or DEFAULT_REMOTE_CONCURRENCY
+    worker_args = worker_config.worker_args(
+        concurrency=f'"${{TASK_CONCURRENCY:-{default_concurrency}}}"'
+    )
+    return template.format(worker_args=" ".join(worker_args))
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from bridge.config import BridgeConfig
+from bridge.console import console
+from bridge.service.docker import get_docker_client
+from bridge.service.images import pull_images
+from bridge.service.pgbouncer import PgBouncerConfig
+from bridge.service.postgres import PostgresConfig
+from bridge.service.redis import RedisConfig
+
+
+def required_images(bridge_config: BridgeConfig) -> list[str]:
+    """The images of the local services `bridge_config` enables."""
+    images = []
+    if bridge_config.enable_postgres:
+        # The test server uses the same image
+        images.append(
+            PostgresConfig.from_database_config(
+                bridge_config.postgres, bridge_config.image_variant
+            ).image
+        )
+        if bridge_config.postgres.pgbouncer:
+            images.append(PgBouncerConfig().image)
+    if bridge_config.enable_worker or bridge_config.enable_cache:
+        images.append(
+            RedisConfig.from_server_config(
+                bridge_config.redis, bridge_config.image_variant
+            ).image
+        )
+    return images
+
+
+def pull(bridge_config: BridgeConfig):
+    images = required_images(bridge_config)
+    pull_images(get_docker_client(), images)
+    timestamp_str = datetime.now().strftime("[%H:%M:%S]")
+    console.print(
+        f"{timestamp_str} [bright_green]✓[/bright_green] Pulled {len(images)} images",
+        highlight=False,
+    )
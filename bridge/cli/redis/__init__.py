@@ -1,10 +1,16 @@
 import docker
 
-from bridge.service.redis import RedisService
+from bridge.config import get_config
+from bridge.platform.redis import RedisRole
+from bridge.service.redis import RedisConfig, RedisService
 
 
-def open_redis_shell():
+def open_redis_shell(role: RedisRole = "broker"):
     client = docker.from_env()
-    postgres_service = RedisService(client=client)
-    postgres_service.start()
-    postgres_service.shell()
+    bridge_config = get_config()
+    config = RedisConfig.from_server_config(
+        bridge_config.redis, bridge_config.image_variant
+    )
+    redis_service = RedisService(client=client, config=config)
+    redis_service.start()
+    redis_service.shell(role=role)
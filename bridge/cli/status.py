@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from bridge.config import BridgeConfig
+from bridge.console import console, log_info, log_warning
+from bridge.utils.process import is_recorded_process_running
+from bridge.utils.state import read_state
+
+# Ports bound by background processes, which aren't recorded in the state
+PROCESS_PORTS = {"flower": "localhost:5555"}
+
+
+def status(bridge_config: BridgeConfig):
+    """Report the local services from the recorded state, without calling Docker."""
+    from rich.table import Table
+
+    state = read_state()
+    if state.stack is None:
+        log_info("The local stack is not up, run `bridge up` to start it.")
+    elif state.stack.config_hash != bridge_config.config_hash():
+        log_warning(
+            "bridge.yaml changed since the local stack started,"
+            " run `bridge up` to apply the changes."
+        )
+    else:
+        started_at = datetime.fromtimestamp(state.stack.started_at)
+        log_info(f"The local stack has been up since {started_at:%Y-%m-%d %H:%M:%S}.")
+
+    table = Table()
+    table.add_column("Service")
+    table.add_column("Status")
+    table.add_column("Ports")
+    for name, container in state.containers.items():
+        ports = ", ".join(f"localhost:{port}" for port in container.ports.values())
+        # Containers are only recorded once they are verified ready
+        table.add_row(name, "[green]ready", ports)
+    for name, process in state.processes.items():
+        running = is_recorded_process_running(process)
+        table.add_row(
+            name,
+            "[green]running" if running else "[red]exited",
+            PROCESS_PORTS.get(name, ""),
+        )
+    if table.row_count:
+        console.print(table)
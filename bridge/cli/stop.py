@@ -1,40 +1,45 @@
 import os
-import signal
 from typing import cast
 
 import docker
-import psutil
 from docker.errors import NotFound
 from docker.models.containers import Container
 
 from bridge.console import log_task
 from bridge.utils.filesystem import resolve_dot_bridge
+from bridge.utils.process import stop_background_process
+from bridge.utils.state import read_state, update_state
 
 
 def stop():
     with log_task("Stopping bridge services...", "All bridge services stopped"):
         bridge_path = resolve_dot_bridge()
+        state = read_state()
         # Docker - postgres, redis
+        container_ids = [
+            container.container_id for container in state.containers.values()
+        ]
+        # Containers recorded by older versions of bridge
         cid_path = bridge_path / "cid"
         if os.path.exists(cid_path):
-            docker_client = docker.from_env()
             with open(cid_path) as f:
-                for cid in f.readlines():
-                    cid = cid.strip()
-                    try:
-                        container = docker_client.containers.get(cid)
-                        container = cast(Container, container)
-                        container.stop()
-                    except NotFound:
-                        pass
+                container_ids.extend(cid.strip() for cid in f.readlines())
+        if container_ids:
+            docker_client = docker.from_env()
+            for cid in dict.fromkeys(container_ids):
+                try:
+                    container = docker_client.containers.get(cid)
+                    container = cast(Container, container)
+                    container.stop()
+                except NotFound:
+                    pass
+        if os.path.exists(cid_path):
             os.remove(cid_path)
+        with update_state() as updated_state:
+            updated_state.containers.clear()
+            updated_state.stack = None
+            # A runserver started after this must start the services again
+            updated_state.reloader_session = None
         # Processes - celery, flower
-        # TODO make this a helper method
-        for proc in psutil.process_iter(["pid", "name", "cmdline"]):
-            try:
-                # Check if the name fragment is in the command line; this field is a list
-                proc_name = proc.info["cmdline"]
-                if proc_name and "bridge.service.django_celery" in proc_name:
-                    proc.send_signal(signal.SIGTERM)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+        for name in state.processes:
+            stop_background_process(name)
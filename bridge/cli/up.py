@@ -0,0 +1,35 @@
+import os
+
+from bridge.cli.init.render import detect_django_settings_module
+from bridge.config import BridgeConfig
+from bridge.console import console
+from bridge.framework import Framework
+from bridge.utils.filesystem import resolve_project_dir
+
+
+def up(framework: Framework, bridge_config: BridgeConfig):
+    if framework != Framework.DJANGO:
+        raise NotImplementedError(f"Unsupported framework: {framework}")
+
+    from bridge.framework.django import DjangoHandler
+
+    project_dir = resolve_project_dir()
+    # The worker and flower import the settings module from the project directory,
+    # as they would when started by manage.py
+    if "DJANGO_SETTINGS_MODULE" not in os.environ:
+        os.environ["DJANGO_SETTINGS_MODULE"] = detect_django_settings_module(
+            project_name=project_dir.name
+        )
+    os.environ["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(project_dir), os.environ.get("PYTHONPATH")])
+    )
+    handler = DjangoHandler(
+        project_name=project_dir.name,
+        framework_locals={},
+        bridge_config=bridge_config,
+    )
+    handler.up()
+    console.print(
+        "[bold bright_green]All services are up![/bold bright_green]"
+        " Run `bridge stop` to stop them."
+    )
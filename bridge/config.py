@@ -1,18 +1,268 @@
+import hashlib
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 import yaml
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from yaml import CDumper as Dumper
 from yaml import CLoader as Loader
 from yaml import dump, load
 
 from bridge.console import log_warning
 
+# Worker concurrency when it is not configured in bridge.yaml
+DEFAULT_LOCAL_CONCURRENCY = 1
+DEFAULT_REMOTE_CONCURRENCY = 4
+
+# Named groups of Celery settings, see bridge.service.celery_profiles
+CeleryProfile = Literal["throughput", "latency", "long-running"]
+
+# Where Celery stores task results: in Redis alongside the broker, in the
+# project's Postgres database (requires SQLAlchemy), or nowhere
+ResultBackend = Literal["redis", "postgres", "disabled"]
+
+
+class WorkerConfig(BaseModel):
+    """Settings for the Celery worker, applied both locally and on remote platforms."""
+
+    # Number of pool processes (or threads/greenlets, depending on the pool).
+    # Defaults to 1 locally, and 4 on remote platforms.
+    concurrency: Optional[int] = Field(default=None, ge=1)
+    pool: Literal["prefork", "threads", "gevent", "solo"] = "prefork"
+    # Grow and shrink the pool between these bounds, instead of a fixed concurrency
+    autoscale_min: Optional[int] = Field(default=None, ge=0)
+    autoscale_max: Optional[int] = Field(default=None, ge=1)
+    # Replace a pool process after it has run this many tasks
+    max_tasks_per_child: Optional[int] = Field(default=None, ge=1)
+    # Replace a pool process once its resident memory exceeds this many KiB
+    max_memory_per_child: Optional[int] = Field(default=None, ge=1)
+    # How many messages each pool process reserves ahead of time (0 means no limit)
+    prefetch_multiplier: Optional[int] = Field(default=None, ge=0)
+    # Tune Celery's settings for a kind of workload. Settings defined in your
+    # settings module, and prefetch_multiplier above, take precedence.
+    profile: Optional[CeleryProfile] = None
+    result_backend: ResultBackend = "redis"
+    # Seconds to keep task results for
+    result_expires: int = Field(default=24 * 60 * 60, ge=0)
+    # Override the logical Redis database for results, which is otherwise
+    # the one after the broker's (see bridge.platform.redis)
+    result_redis_db: Optional[int] = Field(default=None, ge=0)
+    # Restart the local worker if it exits unexpectedly, backing off between restarts
+    restart: bool = True
+    restart_backoff_initial: float = Field(default=1.0, gt=0)
+    restart_backoff_max: float = Field(default=30.0, gt=0)
+    # Rotate the local worker log in .bridge/logs once it reaches this size
+    log_max_bytes: int = Field(default=10 * 1024 * 1024, ge=0)
+    log_backup_count: int = Field(default=3, ge=0)
+
+    @model_validator(mode="after")
+    def check_autoscale(self) -> "WorkerConfig":
+        if self.autoscale_max is None:
+            if self.autoscale_min is not None:
+                raise ValueError("autoscale_min requires autoscale_max")
+        elif self.autoscale_min is not None and self.autoscale_min > self.autoscale_max:
+            raise ValueError("autoscale_min must not be greater than autoscale_max")
+        return self
+
+    def worker_args(self, concurrency: str) -> list[str]:
+        """
+        Command line arguments for `celery worker` implementing this config.
+        `concurrency` is used unless autoscaling, and may be a shell expression
+        (e.g. an environment variable with a fallback) when templating scripts.
+        """
+        args = ["--pool", self.pool]
+        if self.autoscale_max is not None:
+            # Celery takes the bounds as max,min
+            args.append(f"--autoscale={self.autoscale_max},{self.autoscale_min or 0}")
+        else:
+            args.extend(["--concurrency", concurrency])
+        if self.max_tasks_per_child is not None:
+            args.append(f"--max-tasks-per-child={self.max_tasks_per_child}")
+        if self.max_memory_per_child is not None:
+            args.append(f"--max-memory-per-child={self.max_memory_per_child}")
+        return args
+
+
+# Trade durability for speed, for throwaway local data
+DEV_FAST_POSTGRES_SETTINGS = {
+    "fsync": "off",
+    "synchronous_commit": "off",
+    "full_page_writes": "off",
+}
+
+
+class PostgresServerConfig(BaseModel):
+    """Settings for the local Postgres server, which are passed to it as `-c` flags."""
+
+    # "dev-fast" turns off fsync, synchronous_commit and full_page_writes
+    preset: Optional[Literal["dev-fast"]] = None
+    shared_buffers: Optional[str] = None
+    work_mem: Optional[str] = None
+    max_connections: Optional[int] = Field(default=None, ge=1)
+    max_parallel_workers: Optional[int] = Field(default=None, ge=0)
+    # Any other postgresql.conf settings, which take precedence over the above
+    settings: dict[str, str] = Field(default_factory=dict)
+    # Size of /dev/shm, which parallel queries need more of than Docker's default 64MB
+    shm_size: str = "256m"
+
+    def server_settings(self) -> dict[str, str]:
+        settings: dict[str, str] = {}
+        if self.preset == "dev-fast":
+            settings.update(DEV_FAST_POSTGRES_SETTINGS)
+        for name in [
+            "shared_buffers",
+            "work_mem",
+            "max_connections",
+            "max_parallel_workers",
+        ]:
+            value = getattr(self, name)
+            if value is not None:
+                settings[name] = str(value)
+        settings.update(self.settings)
+        return settings
+
+
+class DatabaseConfig(BaseModel):
+    """Settings for connections to Postgres, when `enable_postgres` is set."""
+
+    # "none" opens a connection for each request (Django's default),
+    # "persistent" reuses each connection for up to `conn_max_age` seconds,
+    # "pool" uses psycopg's connection pool (requires Django 5.1 and psycopg[pool])
+    pooling: Literal["none", "persistent", "pool"] = "none"
+    conn_max_age: int = Field(default=600, ge=0)
+    # Check persistent connections are usable before reusing them for a request
+    conn_health_checks: bool = True
+    pool_min_size: int = Field(default=2, ge=0)
+    pool_max_size: int = Field(default=10, ge=1)
+    # Seconds to wait for a connection from the pool before raising an error
+    pool_timeout: float = Field(default=10.0, gt=0)
+    # Seconds after which idle connections above `pool_min_size` are closed
+    pool_max_idle: float = Field(default=300.0, gt=0)
+    # Route connections through PgBouncer in transaction pooling mode
+    pgbouncer: bool = False
+    # Server connections PgBouncer opens to Postgres, per database and user
+    pgbouncer_pool_size: int = Field(default=20, ge=1)
+    # Client connections PgBouncer accepts from the app and workers
+    pgbouncer_max_client_conn: int = Field(default=1000, ge=1)
+    # Run tests against a separate, throwaway Postgres server, with its data on
+    # tmpfs and durability turned off. "auto" does so for the test command.
+    test_server: Literal["auto", "always", "never"] = "auto"
+    # Size of the test server's tmpfs data directory
+    test_server_tmpfs_size: str = "1g"
+    # Create test databases by cloning a migrated template, which is rebuilt
+    # only when migrations change (see bridge.service.django_test_runner)
+    template_test_databases: bool = False
+    # Only applies to the local Postgres containers
+    server: PostgresServerConfig = Field(default_factory=PostgresServerConfig)
+
+    @model_validator(mode="after")
+    def check_pool_size(self) -> "DatabaseConfig":
+        if self.pool_min_size > self.pool_max_size:
+            raise ValueError("pool_min_size must not be greater than pool_max_size")
+        return self
+
+
+class CacheConfig(BaseModel):
+    """Settings for the Redis-backed cache, when `enable_cache` is set."""
+
+    # Default expiry of cache keys, in seconds
+    timeout: int = Field(default=300, ge=0)
+    key_prefix: str = ""
+    # Connection pool options, passed through to redis-py
+    max_connections: int = Field(default=50, ge=1)
+    socket_timeout: float = Field(default=5.0, gt=0)
+    socket_connect_timeout: float = Field(default=5.0, gt=0)
+    # Store sessions in the cache only ("cache"), or in the cache with the
+    # database as a fallback ("cached_db"). Sessions are left alone if unset.
+    session_engine: Optional[Literal["cache", "cached_db"]] = None
+
+
+# Keep everything in memory, for throwaway local data
+DEV_FAST_REDIS_SETTINGS = {
+    "appendonly": "no",
+    "save": "",
+}
+
+RedisEvictionPolicy = Literal[
+    "noeviction",
+    "allkeys-lru",
+    "allkeys-lfu",
+    "allkeys-random",
+    "volatile-lru",
+    "volatile-lfu",
+    "volatile-random",
+    "volatile-ttl",
+]
+
+
+class RedisServerConfig(BaseModel):
+    """Settings for the local Redis server, which are passed to redis-server as flags."""
+
+    # "dev-fast" turns off both RDB snapshots and the append-only file
+    preset: Optional[Literal["dev-fast"]] = None
+    # e.g. "256mb", unlimited if unset
+    maxmemory: Optional[str] = None
+    # A Celery broker should use "noeviction", so queued tasks are never evicted
+    maxmemory_policy: Optional[RedisEvictionPolicy] = None
+    appendonly: Optional[bool] = None
+    appendfsync: Optional[Literal["always", "everysec", "no"]] = None
+    # RDB snapshot points, e.g. "3600 1 300 100", or "" to turn snapshots off
+    save: Optional[str] = None
+    io_threads: Optional[int] = Field(default=None, ge=1)
+    # Any other redis.conf settings, which take precedence over the above
+    settings: dict[str, str] = Field(default_factory=dict)
+    # Keep Redis' data in .bridge/redisdata, so it survives the container
+    persist: bool = False
+
+    def server_settings(self) -> dict[str, str]:
+        settings: dict[str, str] = {}
+        if self.preset == "dev-fast":
+            settings.update(DEV_FAST_REDIS_SETTINGS)
+        if self.maxmemory is not None:
+            settings["maxmemory"] = self.maxmemory
+        if self.maxmemory_policy is not None:
+            settings["maxmemory-policy"] = self.maxmemory_policy
+        if self.appendonly is not None:
+            settings["appendonly"] = "yes" if self.appendonly else "no"
+        if self.appendfsync is not None:
+            settings["appendfsync"] = self.appendfsync
+        if self.save is not None:
+            settings["save"] = self.save
+        if self.io_threads is not None:
+            settings["io-threads"] = str(self.io_threads)
+            if self.io_threads > 1:
+                # By default, the extra threads only write replies
+                settings["io-threads-do-reads"] = "yes"
+        settings.update(self.settings)
+        return settings
+
 
 class BridgeConfig(BaseModel):
     enable_postgres: bool = True
     enable_worker: bool = True
+    # Use Redis for the framework's cache (e.g. Django's CACHES)
+    enable_cache: bool = False
+    # Start independent local services in parallel
+    concurrent_startup: bool = True
+    # Record the time spent in each startup phase (same as BRIDGE_TRACE=1)
+    trace: bool = False
+    # Run the local Postgres and Redis containers from a smaller image variant
+    image_variant: Optional[Literal["alpine"]] = None
+    postgres: DatabaseConfig = Field(default_factory=DatabaseConfig)
+    worker: WorkerConfig = Field(default_factory=WorkerConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    # Only applies to the local Redis container, apart from maxmemory_policy
+    redis: RedisServerConfig = Field(default_factory=RedisServerConfig)
+
+    @model_validator(mode="after")
+    def check_result_backend(self) -> "BridgeConfig":
+        if self.worker.result_backend == "postgres" and not self.enable_postgres:
+            raise ValueError("The postgres result backend requires enable_postgres")
+        return self
+
+    def config_hash(self) -> str:
+        """A hash of this configuration, to detect services started with another one."""
+        return hashlib.sha256(self.model_dump_json().encode()).hexdigest()[:16]
 
     def to_yaml(self) -> str:
         return dump(self.model_dump(), Dumper=Dumper)
@@ -1,37 +1,108 @@
+import sys
+import threading
 from contextlib import contextmanager
 from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional
 
-from rich.console import Console
+from bridge.trace import span, strip_markup
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.status import Status
+
+# NOTE: rich is imported lazily, since it is only needed for interactive output
+#   and importing it would slow down settings import on remote platforms.
+_console: Optional["Console"] = None
+
+
+def get_console() -> "Console":
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+def __getattr__(name: str) -> Any:
+    # Supports `from bridge.console import console` without importing rich eagerly
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Rich only supports a single live display at a time, so tasks which run
+# concurrently (e.g. services starting in parallel) share one status spinner.
+_status_lock = threading.Lock()
+_active_messages: list[str] = []
+_status: Optional["Status"] = None
+
+
+def _status_text() -> str:
+    return "\n".join(f"      {message}" for message in _active_messages)
+
+
+def _start_status_message(message: str) -> None:
+    global _status
+    with _status_lock:
+        _active_messages.append(message)
+        if _status is None:
+            _status = get_console().status(
+                _status_text(), spinner="aesthetic", spinner_style="blue"
+            )
+            _status.start()
+        else:
+            _status.update(_status_text())
+
+
+def _end_status_message(message: str) -> None:
+    global _status
+    with _status_lock:
+        _active_messages.remove(message)
+        if _status is None:
+            return
+        if _active_messages:
+            _status.update(_status_text())
+        else:
+            _status.stop()
+            _status = None
 
 
 @contextmanager
-def log_task(start_message: str, end_message: str):
-    with console.status(
-        f"      {start_message}", spinner="aesthetic", spinner_style="blue"
-    ):
-        try:
-            # Before entering the block
+def log_task(start_message: str, end_message: str, span_name: Optional[str] = None):
+    _start_status_message(start_message)
+    try:
+        # Before entering the block
+        with span(span_name or strip_markup(start_message)):
             yield
-        finally:
-            # After exiting the block
-
-            # Format the current time to include leading zeros (HH:MM:SS)
-            timestamp_str = datetime.now().strftime("[%H:%M:%S]")
-            console.print(
-                f"{timestamp_str} [bright_green]✓[/bright_green] {end_message}",
-                highlight=False,
-            )
+    finally:
+        # After exiting the block
+        _end_status_message(start_message)
+
+        # Format the current time to include leading zeros (HH:MM:SS)
+        timestamp_str = datetime.now().strftime("[%H:%M:%S]")
+        get_console().print(
+            f"{timestamp_str} [bright_green]✓[/bright_green] {end_message}",
+            highlight=False,
+        )
+
+
+def _log(styled_prefix: str, prefix: str, message: str) -> None:
+    if _console is None and not sys.stdout.isatty():
+        # Output is not interactive (e.g. logs on a remote platform),
+        # so there is nothing to gain from importing rich for styling.
+        print(f"{prefix}: {message}", flush=True)
+    else:
+        get_console().print(f"{styled_prefix}: {message}")
 
 
 def log_error(message: str) -> None:
-    console.print(f"[bright_red]✗ Bridge Error[/bright_red]: {message}")
+    _log("[bright_red]✗ Bridge Error[/bright_red]", "✗ Bridge Error", message)
 
 
 def log_warning(message: str) -> None:
-    console.print(f"[yellow]Bridge Warning[/yellow]: {message}")
+    _log("[yellow]Bridge Warning[/yellow]", "Bridge Warning", message)
 
 
 def log_info(message: str) -> None:
-    console.print(f"[cyan]Bridge Info[/cyan]: {message}")
+    _log("[cyan]Bridge Info[/cyan]", "Bridge Info", message)
@@ -1,14 +1,24 @@
 import os
+import time
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any
-
-import docker
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 from bridge.config import BridgeConfig
 from bridge.platform import Platform, detect_platform
-from bridge.service.postgres import PostgresService
-from bridge.service.redis import RedisService
+from bridge.service.orchestrator import NodeResult, ServiceGraph
+from bridge.trace import enable_tracing, is_tracing_enabled, span, tracer
+from bridge.utils.filesystem import resolve_dot_bridge
+from bridge.utils.process import BACKGROUND_PROCESS_ENV_VAR
+from bridge.utils.state import StackState, read_state, update_state
+
+if TYPE_CHECKING:
+    import docker
+
+# NOTE: service modules (and docker, psycopg, redis) are imported lazily,
+#   since they are only needed to run services locally, and importing them
+#   would slow down settings import for every process on remote platforms.
 
 
 class Framework(Enum):
@@ -30,6 +40,19 @@ class FrameWorkHandler(ABC):
         self.framework_locals = framework_locals
         self.enable_postgres = bridge_config.enable_postgres
         self.enable_worker = bridge_config.enable_worker
+        self.enable_cache = bridge_config.enable_cache
+        self.concurrent_startup = bridge_config.concurrent_startup
+        self.database_config = bridge_config.postgres
+        self.worker_config = bridge_config.worker
+        self.cache_config = bridge_config.cache
+        self.redis_config = bridge_config.redis
+        self.image_variant = bridge_config.image_variant
+        self.config_hash = bridge_config.config_hash()
+        # Set by `bridge up`, which starts every service regardless of the command
+        self.starting_stack = False
+        self.service_timings: dict[str, NodeResult] = {}
+        if bridge_config.trace:
+            enable_tracing()
 
     def is_remote(self) -> bool:
         """
@@ -41,35 +64,155 @@ class FrameWorkHandler(ABC):
 
     def run(self) -> None:
         """Start services."""
-        platform = detect_platform() if self.is_remote() else Platform.LOCAL
+        with span("detect_platform"):
+            platform = detect_platform() if self.is_remote() else Platform.LOCAL
         self.configure_services(platform)
+        if (
+            platform == Platform.LOCAL
+            and not os.environ.get(BACKGROUND_PROCESS_ENV_VAR)
+            and not self.is_stack_up()
+        ):
+            with span("start_local_services"):
+                self.start_local_services()
+        if is_tracing_enabled():
+            self.report_trace(platform)
+
+    def report_trace(self, platform: Platform) -> None:
+        tracer.print_summary()
         if platform == Platform.LOCAL:
-            self.start_local_services()
+            # .bridge is only guaranteed to be available locally
+            tracer.write_json(resolve_dot_bridge() / "trace.json")
+
+    def is_test_run(self) -> bool:
+        """
+        Check if the application is being started to run its tests.
+        Specific frameworks should override this method.
+        """
+        return False
+
+    def use_test_database_server(self, platform: Platform) -> bool:
+        """Check if the local throwaway Postgres test server should be used."""
+        if platform != Platform.LOCAL:
+            return False
+        test_server = self.database_config.test_server
+        return test_server == "always" or (test_server == "auto" and self.is_test_run())
+
+    def is_stack_up(self) -> bool:
+        """
+        Check if `bridge up` started the local stack with the current configuration,
+        using only the recorded state. Settings imports then have no Docker work to do.
+        """
+        from bridge.utils.process import is_recorded_process_running
+
+        with span("check_stack"):
+            state = read_state()
+            return (
+                state.stack is not None
+                and state.stack.config_hash == self.config_hash
+                # Tests may need the throwaway test server, which is started separately
+                and not self.use_test_database_server(Platform.LOCAL)
+                # Background processes may have exited, e.g. after a crash
+                and all(
+                    is_recorded_process_running(process)
+                    for process in state.processes.values()
+                )
+            )
+
+    def up(self) -> None:
+        """Start every local service, including background processes, and record the stack."""
+        self.starting_stack = True
+        with update_state() as state:
+            state.stack = None
+        self.start_local_services()
+        with update_state() as state:
+            state.stack = StackState(
+                started_at=time.time(), config_hash=self.config_hash
+            )
 
     def configure_services(self, platform: Platform) -> None:
         if self.enable_postgres:
-            self.configure_postgres(platform=platform)
+            with span("configure_postgres"):
+                self.configure_postgres(platform=platform)
+        if self.enable_cache:
+            with span("configure_cache"):
+                self.configure_cache(platform=platform)
         if self.enable_worker:
             # NOTE: worker and flower MUST be configured last, since they
             # will read the framework locals immediately
-            self.configure_worker(platform=platform)
+            with span("configure_worker"):
+                self.configure_worker(platform=platform)
 
     def start_local_services(self):
         """Start local services if necessary"""
+        import docker
+
         client = docker.from_env()
-        if self.enable_postgres:
-            self.start_local_postgres(client)
+        graph = self.build_local_service_graph(client)
+        self.service_timings = graph.run(parallel=self.concurrent_startup)
+
+    def build_local_service_graph(self, client: "docker.DockerClient") -> ServiceGraph:
+        """
+        Declare the local services, and the services each of them depends on.
+        Services without a dependency between them are started in parallel.
+        """
+        graph = ServiceGraph()
+        if self.enable_postgres and self.use_test_database_server(Platform.LOCAL):
+            # Tests connect to the test server directly, without PgBouncer
+            graph.add("postgres", partial(self.start_local_test_postgres, client))
+        elif self.enable_postgres:
+            graph.add("postgres", partial(self.start_local_postgres, client))
+            if self.database_config.pgbouncer:
+                graph.add(
+                    "pgbouncer",
+                    partial(self.start_local_pgbouncer, client),
+                    depends_on=["postgres"],
+                )
+        if self.enable_worker or self.enable_cache:
+            graph.add("redis", partial(self.start_local_redis, client))
         if self.enable_worker:
-            self.start_local_redis(client)
-            self.start_local_worker()
-            self.start_local_flower()
+            # Redis is the broker for both the worker and flower
+            graph.add("worker", self.start_local_worker, depends_on=["redis"])
+            graph.add("flower", self.start_local_flower, depends_on=["redis"])
+        return graph
+
+    def start_local_postgres(self, client: "docker.DockerClient") -> None:
+        from bridge.service.postgres import PostgresConfig, PostgresService
+
+        service = PostgresService(
+            client=client,
+            config=PostgresConfig.from_database_config(
+                self.database_config, self.image_variant
+            ),
+        )
+        service.start()
+
+    def start_local_test_postgres(self, client: "docker.DockerClient") -> None:
+        from bridge.service.postgres import PostgresConfig, PostgresService
+
+        service = PostgresService(
+            client=client,
+            config=PostgresConfig.for_tests(self.database_config, self.image_variant),
+        )
+        service.start()
+
+    def start_local_pgbouncer(self, client: "docker.DockerClient") -> None:
+        from bridge.service.pgbouncer import PgBouncerConfig, PgBouncerService
 
-    def start_local_postgres(self, client: docker.DockerClient) -> None:
-        service = PostgresService(client=client)
+        service = PgBouncerService(
+            client=client,
+            config=PgBouncerConfig.from_database_config(self.database_config),
+        )
         service.start()
 
-    def start_local_redis(self, client: docker.DockerClient) -> None:
-        service = RedisService(client=client)
+    def start_local_redis(self, client: "docker.DockerClient") -> None:
+        from bridge.service.redis import RedisConfig, RedisService
+
+        service = RedisService(
+            client=client,
+            config=RedisConfig.from_server_config(
+                self.redis_config, self.image_variant
+            ),
+        )
         service.start()
 
     @abstractmethod
@@ -86,6 +229,11 @@ class FrameWorkHandler(ABC):
         """Update framework_locals with the correct configuration for postgres"""
         pass
 
+    @abstractmethod
+    def configure_cache(self, platform: Platform) -> None:
+        """Update framework_locals with the correct configuration for the redis cache"""
+        pass
+
     @abstractmethod
     def configure_worker(self, platform: Platform) -> None:
         """Update framework_locals with the correct configuration for celery"""
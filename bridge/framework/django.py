@@ -1,21 +1,102 @@
 import os
-import signal
 import socket
-import subprocess
 import sys
-from time import sleep
+from importlib.util import find_spec
+from pathlib import Path
 from typing import Any
 
-import psutil
-from rich.console import Console
-
-from bridge.config import get_config
-from bridge.console import log_info, log_task, log_warning
+from bridge.config import DEFAULT_LOCAL_CONCURRENCY, get_config
+from bridge.console import get_console, log_info, log_task, log_warning
 from bridge.framework.base import Framework, FrameWorkHandler
 from bridge.platform import Platform
-from bridge.platform.postgres import build_postgres_environment
-from bridge.platform.redis import build_redis_environment
+from bridge.platform.postgres import (
+    LOCAL_TEST_POSTGRES_PORT,
+    build_pgbouncer_environment,
+    build_postgres_environment,
+)
+from bridge.platform.redis import RedisEnvironment, build_redis_environment
+from bridge.service.orchestrator import ServiceStartupError
+from bridge.service.readiness import (
+    ReadinessError,
+    ReadinessTimeoutError,
+    wait_until_ready,
+)
+from bridge.trace import span
 from bridge.utils.filesystem import resolve_dot_bridge
+from bridge.utils.process import (
+    WORKER_READY_FILE_ENV_VAR,
+    is_recorded_process_running,
+    process_create_time,
+    spawn_background_process,
+    stop_background_process,
+)
+from bridge.utils.state import ProcessState, read_state, update_state
+
+RELOADER_COMMANDS = {"runserver", "runserver_plus"}
+# Commands which start the worker and flower in the background
+BACKGROUND_PROCESS_COMMANDS = {"runserver", "runserver_plus", "shell", "shell_plus"}
+
+BRIDGE_TEST_RUNNER = "bridge.service.django_test_runner.BridgeTestRunner"
+
+# Maximum time to wait for the local worker and flower to be ready
+LOCAL_PROCESS_READY_TIMEOUT = 60.0
+
+
+def is_reloader_child() -> bool:
+    """Check if this process was spawned by Django's (or werkzeug's) autoreloader."""
+    return (
+        os.environ.get("RUN_MAIN") == "true"
+        or os.environ.get("WERKZEUG_RUN_MAIN") == "true"
+    )
+
+
+def is_reloader_parent() -> bool:
+    """Check if this process will spawn autoreloader children."""
+    return (
+        not is_reloader_child()
+        and bool(set(sys.argv) & RELOADER_COMMANDS)
+        and "--noreload" not in sys.argv
+    )
+
+
+def record_reloader_session() -> None:
+    """Record that this reloader parent has bootstrapped local services."""
+    pid = os.getpid()
+    with update_state() as state:
+        state.reloader_session = ProcessState(
+            pid=pid, create_time=process_create_time(pid) or 0.0
+        )
+
+
+def in_bootstrapped_reloader_session() -> bool:
+    """Check if the reloader parent of this process already bootstrapped local services."""
+    if not is_reloader_child():
+        return False
+    session = read_state().reloader_session
+    # The creation time guards against a stale session with a reused pid
+    return (
+        session is not None
+        and session.pid == os.getppid()
+        and is_recorded_process_running(session)
+    )
+
+
+def supports_connection_pool() -> bool:
+    """Check for Django's psycopg connection pool support (Django 5.1+, psycopg[pool])."""
+    import django
+
+    # VERSION is a tuple, which unlike the version string also covers pre-releases (5.1rc1)
+    return django.VERSION[:2] >= (5, 1) and find_spec("psycopg_pool") is not None
+
+
+def worker_log_file() -> Path:
+    """The supervised worker's output, see bridge.utils.supervisor."""
+    return resolve_dot_bridge() / "logs" / "worker.log"
+
+
+def is_flower_port_bound() -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        return s.connect_ex(("localhost", 5555)) == 0
 
 
 class DjangoHandler(FrameWorkHandler):
@@ -28,13 +109,29 @@ class DjangoHandler(FrameWorkHandler):
         is_debug_mode = bool(self.framework_locals.get("DEBUG"))
         return super().is_remote() or not is_debug_mode
 
+    def is_test_run(self) -> bool:
+        return len(sys.argv) > 1 and sys.argv[1] == "test"
+
     def configure_services(self, platform: Platform) -> None:
         super().configure_services(platform)
         # Additional Django-specific configuration
-        self.configure_staticfiles(platform)
-        self.configure_allowed_hosts(platform)
-        self.configure_debug(platform)
-        self.configure_secret_key(platform)
+        with span("configure_staticfiles"):
+            self.configure_staticfiles(platform)
+        with span("configure_allowed_hosts"):
+            self.configure_allowed_hosts(platform)
+        with span("configure_debug"):
+            self.configure_debug(platform)
+        with span("configure_secret_key"):
+            self.configure_secret_key(platform)
+
+    def start_local_services(self):
+        if in_bootstrapped_reloader_session():
+            # Services were started once for this runserver session,
+            # autoreloads reuse them rather than restarting them.
+            return
+        super().start_local_services()
+        if is_reloader_parent():
+            record_reloader_session()
 
     def configure_postgres(self, platform: Platform) -> None:
         if "DATABASES" in self.framework_locals:
@@ -43,16 +140,86 @@ class DjangoHandler(FrameWorkHandler):
             )
 
         environment = build_postgres_environment(platform=platform)
-        self.framework_locals["DATABASES"] = {
-            "default": {
-                "ENGINE": "django.db.backends.postgresql",
-                "NAME": environment.db,
-                "USER": environment.user,
-                "PASSWORD": environment.password,
-                "HOST": environment.host,
-                "PORT": environment.port,
-            }
+        pgbouncer_environment = None
+        if self.use_test_database_server(platform):
+            environment.port = LOCAL_TEST_POSTGRES_PORT
+        elif self.database_config.pgbouncer:
+            pgbouncer_environment = build_pgbouncer_environment(platform, environment)
+            if pgbouncer_environment is None:
+                log_warning(
+                    "PgBouncer is not available on this platform,"
+                    " connecting to Postgres directly."
+                )
+            else:
+                environment = pgbouncer_environment
+        database: dict[str, Any] = {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": environment.db,
+            "USER": environment.user,
+            "PASSWORD": environment.password,
+            "HOST": environment.host,
+            "PORT": environment.port,
         }
+        # Preserve any Postgres OPTIONS the user has set (e.g. sslmode)
+        existing_database = self.framework_locals.get("DATABASES", {}).get(
+            "default", {}
+        )
+        options: dict[str, Any] = {}
+        if "postgresql" in existing_database.get("ENGINE", "postgresql"):
+            options.update(existing_database.get("OPTIONS", {}))
+        database.update(self.build_connection_settings(options))
+        if pgbouncer_environment is not None:
+            # In transaction pooling mode, consecutive transactions may use different
+            # server connections, so server-side cursors and prepared statements
+            # (which psycopg creates automatically) can't be relied on
+            database["DISABLE_SERVER_SIDE_CURSORS"] = True
+            options.setdefault("prepare_threshold", None)
+        if options:
+            database["OPTIONS"] = options
+        self.framework_locals["DATABASES"] = {"default": database}
+
+        if self.database_config.template_test_databases:
+            test_runner = self.framework_locals.setdefault(
+                "TEST_RUNNER", BRIDGE_TEST_RUNNER
+            )
+            if test_runner != BRIDGE_TEST_RUNNER:
+                log_info(
+                    f"TEST_RUNNER is set to {test_runner}, template test databases"
+                    f" require it to subclass {BRIDGE_TEST_RUNNER}."
+                )
+
+    def build_connection_settings(self, options: dict[str, Any]) -> dict[str, Any]:
+        """
+        Settings for the configured connection pooling mode.
+        Pool settings are added to `options`, unless the user has set their own.
+        """
+        database_config = self.database_config
+        pooling = database_config.pooling
+        if pooling == "pool" and not supports_connection_pool():
+            log_warning(
+                "Connection pooling requires Django 5.1+ and psycopg[pool],"
+                " using persistent connections instead."
+            )
+            pooling = "persistent"
+
+        if pooling == "persistent":
+            return {
+                "CONN_MAX_AGE": database_config.conn_max_age,
+                "CONN_HEALTH_CHECKS": database_config.conn_health_checks,
+            }
+        if pooling == "pool":
+            options.setdefault(
+                "pool",
+                {
+                    "min_size": database_config.pool_min_size,
+                    "max_size": database_config.pool_max_size,
+                    "timeout": database_config.pool_timeout,
+                    "max_idle": database_config.pool_max_idle,
+                },
+            )
+            # Django requires connections to be returned to the pool after each request
+            return {"CONN_MAX_AGE": 0}
+        return {}
 
     def configure_allowed_hosts(self, platform: Platform) -> None:
         if platform == Platform.RENDER:
@@ -126,97 +293,213 @@ class DjangoHandler(FrameWorkHandler):
                     middleware.insert(0, "whitenoise.middleware.WhiteNoiseMiddleware")
             self.framework_locals["MIDDLEWARE"] = middleware
 
+    def configure_cache(self, platform: Platform) -> None:
+        # NOTE: Django's RedisCache backend requires Django 4.0 or later
+        environment = build_redis_environment(platform)
+        cache_config = self.cache_config
+        caches: dict[str, Any] = dict(self.framework_locals.get("CACHES", {}))
+        if "default" in caches:
+            log_info("Overwriting existing default cache configuration with Redis.")
+        caches["default"] = {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": environment.role_url("cache"),
+            "TIMEOUT": cache_config.timeout,
+            "KEY_PREFIX": cache_config.key_prefix,
+            # Passed to the connection pool, which is shared within each process
+            "OPTIONS": {
+                "max_connections": cache_config.max_connections,
+                "socket_timeout": cache_config.socket_timeout,
+                "socket_connect_timeout": cache_config.socket_connect_timeout,
+                "retry_on_timeout": True,
+            },
+        }
+        self.framework_locals["CACHES"] = caches
+
+        if cache_config.session_engine is not None:
+            session_engine = (
+                f"django.contrib.sessions.backends.{cache_config.session_engine}"
+            )
+            if (
+                self.framework_locals.get("SESSION_ENGINE", session_engine)
+                != session_engine
+            ):
+                log_info("Overwriting existing SESSION_ENGINE with the cache backend.")
+            self.framework_locals["SESSION_ENGINE"] = session_engine
+
     def configure_worker(self, platform: Platform) -> None:
         environment = build_redis_environment(platform)
-        self.framework_locals["CELERY_BROKER_URL"] = environment.url
-        self.framework_locals["CELERY_RESULT_BACKEND"] = environment.url
+        self.framework_locals["CELERY_BROKER_URL"] = environment.role_url("broker")
+        self.configure_result_backend(platform, environment)
+        for name, value in self.build_worker_settings().items():
+            # Settings defined by the user take precedence
+            self.framework_locals.setdefault(f"CELERY_{name.upper()}", value)
 
         # This will make sure the app is always imported when
         # Django starts so that shared_task will use this app.
         from bridge.service.django_celery import app  # noqa: F401 type: ignore
 
+    def configure_result_backend(
+        self, platform: Platform, redis_environment: RedisEnvironment
+    ) -> None:
+        result_backend = self.worker_config.result_backend
+        if result_backend == "disabled":
+            # Tasks can still opt in with ignore_result=False, once a backend is set
+            self.framework_locals.setdefault("CELERY_TASK_IGNORE_RESULT", True)
+            return
+
+        if result_backend == "postgres":
+            if find_spec("sqlalchemy") is None:
+                log_warning(
+                    "The postgres result backend requires SQLAlchemy,"
+                    " install it with `pip install sqlalchemy`"
+                )
+            postgres_environment = build_postgres_environment(platform)
+            self.framework_locals["CELERY_RESULT_BACKEND"] = (
+                f"db+{postgres_environment.build_url(scheme='postgresql+psycopg')}"
+            )
+        else:
+            result_db = self.worker_config.result_redis_db
+            self.framework_locals["CELERY_RESULT_BACKEND"] = (
+                redis_environment.role_url("results")
+                if result_db is None
+                else redis_environment.build_url(result_db)
+            )
+        self.framework_locals.setdefault(
+            "CELERY_RESULT_EXPIRES", self.worker_config.result_expires
+        )
+
+    def build_worker_settings(self) -> dict[str, Any]:
+        """Celery settings (without the CELERY_ prefix) from the worker config."""
+        settings: dict[str, Any] = {}
+        if self.worker_config.profile is not None:
+            from bridge.service.celery_profiles import build_profile_settings
+
+            settings.update(build_profile_settings(self.worker_config.profile))
+        # Prefetching is a setting rather than a worker argument, so it applies
+        # to the worker however it is launched
+        if self.worker_config.prefetch_multiplier is not None:
+            settings["worker_prefetch_multiplier"] = (
+                self.worker_config.prefetch_multiplier
+            )
+        return settings
+
+    def expects_background_processes(self) -> bool:
+        """Check if this is a command which expects Celery and flower to be available."""
+        return self.starting_stack or bool(set(sys.argv) & BACKGROUND_PROCESS_COMMANDS)
+
     def start_local_worker(self) -> None:
-        # Confirm we are in a command which expects Celery to be available
-        expected_command_args = {"runserver", "runserver_plus", "shell", "shell_plus"}
-        if set(sys.argv) & expected_command_args:
-            console = Console()
-            console.print(
+        if self.expects_background_processes():
+            get_console().print(
                 "[bold bright_green]Setting up service "
                 "[white]bridge_celery[/white]..."
             )
             with log_task("Starting local worker", "Local worker started"):
-                from bridge.service.django_celery import app
+                # Stop the worker from a previous run, so it picks up code changes
+                stop_background_process("worker")
+                # The worker creates this file once it is ready to accept tasks
+                ready_file = resolve_dot_bridge() / "worker_ready"
+                if ready_file.exists():
+                    ready_file.unlink()
+                with span("bridge_celery.spawn"):
+                    process = spawn_background_process(
+                        "worker",
+                        self.supervised_worker_command(),
+                        env={**os.environ, WORKER_READY_FILE_ENV_VAR: str(ready_file)},
+                    )
+
+                def is_worker_ready() -> bool:
+                    if ready_file.exists():
+                        return True
+                    if not is_recorded_process_running(process):
+                        raise ReadinessError(
+                            "The worker's supervisor exited,"
+                            f" see {worker_log_file()} for its output"
+                        )
+                    return False
 
-                # Kill any active celery processes
-                for proc in psutil.process_iter(["pid", "name", "cmdline"]):
+                with span("bridge_celery.ensure_ready"):
                     try:
-                        proc_name = proc.info["cmdline"]
-                        if (
-                            proc_name
-                            and "bridge.service.django_celery" in proc_name
-                            and "worker" in proc_name
-                        ):
-                            proc.send_signal(signal.SIGTERM)
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
-                subprocess.Popen(
-                    "nohup "
-                    "celery -A bridge.service.django_celery worker -c 1 -l INFO"
-                    " > /dev/null 2>&1 &",
-                    shell=True,
-                    stdin=subprocess.DEVNULL,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.STDOUT,
-                    start_new_session=True,
-                )
-                while not app.control.inspect().ping():
-                    # Wait for celery to start
-                    sleep(0.1)
-            console.print(
+                        wait_until_ready(
+                            is_worker_ready,
+                            description="bridge_celery",
+                            timeout=LOCAL_PROCESS_READY_TIMEOUT,
+                            initial_delay=0.01,
+                            max_delay=0.05,
+                        )
+                    except ReadinessTimeoutError as e:
+                        # e.g. the worker is crashing on startup, and being restarted
+                        raise ReadinessTimeoutError(
+                            f"{e}, see {worker_log_file()} for its output"
+                        ) from e
+            get_console().print(
                 "[bold bright_green]Service [white]bridge_celery[/white] started!"
             )
 
+    def supervised_worker_command(self) -> list[str]:
+        """
+        The Celery worker command, run under bridge's supervisor,
+        which restarts it if it crashes and captures its output to .bridge/logs.
+        """
+        worker_config = self.worker_config
+        if worker_config.pool == "gevent" and find_spec("gevent") is None:
+            raise ServiceStartupError(
+                "The gevent worker pool requires gevent, install it with `pip install gevent`"
+            )
+        command = [
+            sys.executable,
+            "-m",
+            "bridge.utils.supervisor",
+            f"--log-file={worker_log_file()}",
+            f"--log-max-bytes={worker_config.log_max_bytes}",
+            f"--log-backup-count={worker_config.log_backup_count}",
+            f"--backoff-initial={worker_config.restart_backoff_initial}",
+            f"--backoff-max={worker_config.restart_backoff_max}",
+        ]
+        if not worker_config.restart:
+            command.append("--no-restart")
+        return [
+            *command,
+            "--",
+            "celery",
+            "-A",
+            "bridge.service.django_celery",
+            "worker",
+            "-l",
+            "INFO",
+            *worker_config.worker_args(
+                concurrency=str(worker_config.concurrency or DEFAULT_LOCAL_CONCURRENCY)
+            ),
+        ]
+
     def start_local_flower(self) -> None:
-        # Confirm we are in a command which expects flower to be available
-        expected_command_args = {"runserver", "runserver_plus", "shell", "shell_plus"}
-        if set(sys.argv) & expected_command_args:
-            console = Console()
-            console.print(
+        if self.expects_background_processes():
+            get_console().print(
                 "[bold bright_green]Setting up service "
                 "[white]bridge_flower[/white]..."
             )
             with log_task("Starting flower", "Flower started"):
-                # Kill any active flower process
-                for proc in psutil.process_iter(["pid", "name", "cmdline"]):
-                    try:
-                        proc_name = proc.info["cmdline"]
-                        if (
-                            proc_name
-                            and "bridge.service.django_celery" in proc_name
-                            and "flower" in proc_name
-                        ):
-                            proc.send_signal(signal.SIGTERM)
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
+                stop_background_process("flower")
                 dot_bridge_path = resolve_dot_bridge() / "flower_db"
-                subprocess.Popen(
-                    "nohup "
-                    "celery -A bridge.service.django_celery flower "
-                    f"--persistent=True --db='{dot_bridge_path}'"
-                    " > /dev/null 2>&1 &",
-                    shell=True,
-                    stdin=subprocess.DEVNULL,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.STDOUT,
-                    start_new_session=True,
-                )
-                port_bound = False
-                while not port_bound:
-                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                        port_bound = s.connect_ex(("localhost", 5555)) == 0
-                    sleep(0.1)
+                with span("bridge_flower.spawn"):
+                    spawn_background_process(
+                        "flower",
+                        [
+                            "celery",
+                            "-A",
+                            "bridge.service.django_celery",
+                            "flower",
+                            "--persistent=True",
+                            f"--db={dot_bridge_path}",
+                        ],
+                    )
+                with span("bridge_flower.ensure_ready"):
+                    wait_until_ready(
+                        is_flower_port_bound,
+                        description="bridge_flower",
+                        timeout=LOCAL_PROCESS_READY_TIMEOUT,
+                    )
 
-            console.print(
+            get_console().print(
                 "[bold bright_green]Service [white]bridge_flower[/white] started!"
             )
 
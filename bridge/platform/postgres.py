@@ -1,10 +1,21 @@
 import os
+from typing import Optional
+from urllib.parse import quote
 
 from pydantic import BaseModel
 
 from bridge.console import log_warning
 from bridge.platform.base import Platform
 
+# The port PgBouncerService publishes locally
+LOCAL_PGBOUNCER_PORT = 6432
+# Used locally, and for the pgbouncer service `bridge init render` generates
+PGBOUNCER_IMAGE = "edoburu/pgbouncer:v1.23.1-p3"
+# The port the local throwaway test server publishes, apart from the dev database
+LOCAL_TEST_POSTGRES_PORT = 5433
+# Set on Render from the PgBouncer private service's host:port
+PGBOUNCER_HOSTPORT_ENV_VAR = "PGBOUNCER_HOSTPORT"
+
 
 class PostgresEnvironment(BaseModel):
     user: str = "postgres"
@@ -13,6 +24,12 @@ class PostgresEnvironment(BaseModel):
     host: str = "localhost"
     port: int = 5432
 
+    def build_url(self, scheme: str = "postgresql") -> str:
+        return (
+            f"{scheme}://{quote(self.user, safe='')}:{quote(self.password, safe='')}"
+            f"@{self.host}:{self.port}/{self.db}"
+        )
+
     @classmethod
     def from_env(cls):
         try:
@@ -44,3 +61,23 @@ def build_postgres_environment(platform: Platform) -> PostgresEnvironment:
         return PostgresEnvironment.from_env()
     else:
         raise ValueError(f"Unsupported platform for configuring Postgres: {platform}")
+
+
+def build_pgbouncer_environment(
+    platform: Platform, environment: PostgresEnvironment
+) -> Optional[PostgresEnvironment]:
+    """
+    Connection settings to reach the database in `environment` through PgBouncer,
+    or None if PgBouncer is not available on this platform.
+    """
+    if platform == Platform.LOCAL:
+        return environment.model_copy(
+            update={"host": "localhost", "port": LOCAL_PGBOUNCER_PORT}
+        )
+    elif platform == Platform.RENDER:
+        hostport = os.environ.get(PGBOUNCER_HOSTPORT_ENV_VAR)
+        if not hostport:
+            return None
+        host, _, port = hostport.rpartition(":")
+        return environment.model_copy(update={"host": host, "port": int(port)})
+    return None
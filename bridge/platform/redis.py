@@ -1,16 +1,53 @@
+from typing import Literal, Optional
+from urllib.parse import quote
+
 from pydantic import BaseModel
 
 from bridge.platform.base import Platform
 
+RedisRole = Literal["broker", "results", "cache", "channels"]
+
+# Each role uses its own logical database, offset from the environment's base database,
+# so that scans, flushes and evictions for one role don't interfere with the others
+REDIS_ROLE_DB_OFFSETS: dict[str, int] = {
+    "broker": 0,
+    "results": 1,
+    "cache": 2,
+    "channels": 3,
+}
+# Redis' default number of logical databases
+REDIS_DATABASES = 16
+
 
 class RedisEnvironment(BaseModel):
     host: str = "localhost"
     port: int = 6379
+    # The base logical database, used by the broker
     db: int = 0
+    username: Optional[str] = None
+    password: Optional[str] = None
 
     @property
     def url(self) -> str:
-        return f"redis://{self.host}:{self.port}/{self.db}"
+        return self.build_url(self.db)
+
+    def build_url(self, db: int) -> str:
+        credentials = ""
+        if self.password is not None:
+            credentials = f"{quote(self.username or '', safe='')}:{quote(self.password, safe='')}@"
+        return f"redis://{credentials}{self.host}:{self.port}/{db}"
+
+    def role_db(self, role: RedisRole) -> int:
+        db = self.db + REDIS_ROLE_DB_OFFSETS[role]
+        if db >= REDIS_DATABASES:
+            raise ValueError(
+                f"Redis database {db} for {role} is out of range,"
+                f" use a base database below {REDIS_DATABASES - len(REDIS_ROLE_DB_OFFSETS) + 1}"
+            )
+        return db
+
+    def role_url(self, role: RedisRole) -> str:
+        return self.build_url(self.role_db(role))
 
 
 def build_redis_environment(platform: Platform) -> RedisEnvironment:
@@ -1,7 +1,8 @@
 import os
 import re
+from urllib.parse import unquote
 
-from bridge.service.redis import RedisEnvironment
+from bridge.platform.redis import RedisEnvironment
 
 
 def build_render_redis_environment() -> RedisEnvironment:
@@ -11,7 +12,7 @@ def build_render_redis_environment() -> RedisEnvironment:
     if not conn_string:
         raise ValueError("REDIS_URL environment variable must be set on Render.")
     redis_env = RedisEnvironment()
-    # Optional password terminated with '@'
+    # Optional credentials terminated with '@'
     # Hostname that does not contain ':' or '/'
     # Optional port number preceded by ':'
     # Optional database number preceded by '/'
@@ -26,6 +27,13 @@ def build_render_redis_environment() -> RedisEnvironment:
         redis_env.host = components["host"] or "localhost"
         redis_env.port = int(components["port"] or 6379)
         redis_env.db = int(components["db"] or 0)
+        credentials = components["password"]
+        if credentials:
+            # Credentials are either 'password' or 'username:password'
+            if ":" in credentials:
+                username, _, credentials = credentials.partition(":")
+                redis_env.username = unquote(username) or None
+            redis_env.password = unquote(credentials)
     else:
         raise ValueError("Invalid Redis connection string format in REDIS_URL.")
 
@@ -0,0 +1,63 @@
+from importlib.util import find_spec
+from typing import Any
+
+from bridge.config import CeleryProfile
+from bridge.console import log_warning
+
+# Celery settings (without a namespace prefix) for each named profile
+CELERY_PROFILES: dict[str, dict[str, Any]] = {
+    # Many short tasks: reserve batches of messages and keep more broker connections,
+    # trading fairness between workers for fewer round trips to the broker
+    "throughput": {
+        "worker_prefetch_multiplier": 16,
+        "task_acks_late": False,
+        "task_serializer": "msgpack",
+        "result_serializer": "msgpack",
+        "accept_content": ["json", "msgpack"],
+        "broker_pool_limit": 50,
+    },
+    # Tasks should start as soon as a pool process is free,
+    # rather than queueing behind messages another process has reserved
+    "latency": {
+        "worker_prefetch_multiplier": 1,
+        "task_acks_late": False,
+        "task_serializer": "msgpack",
+        "result_serializer": "msgpack",
+        "accept_content": ["json", "msgpack"],
+        "broker_pool_limit": 10,
+        "broker_transport_options": {"socket_timeout": 5, "socket_connect_timeout": 5},
+    },
+    # Slow tasks: reserve one message at a time, acknowledge it only once it is done,
+    # and keep unacknowledged messages invisible for longer than any task runs
+    "long-running": {
+        "worker_prefetch_multiplier": 1,
+        "task_acks_late": True,
+        "task_reject_on_worker_lost": True,
+        "task_serializer": "msgpack",
+        "result_serializer": "msgpack",
+        "accept_content": ["json", "msgpack"],
+        # Large payloads are more likely, and compressing them is cheap next to the task
+        "task_compression": "gzip",
+        "result_compression": "gzip",
+        "broker_pool_limit": 10,
+        "broker_transport_options": {"visibility_timeout": 12 * 60 * 60},
+    },
+}
+
+
+def uses_msgpack(profile: CeleryProfile) -> bool:
+    return CELERY_PROFILES[profile].get("task_serializer") == "msgpack"
+
+
+def build_profile_settings(profile: CeleryProfile) -> dict[str, Any]:
+    """The Celery settings for `profile`, falling back to JSON if msgpack is unavailable."""
+    settings = {**CELERY_PROFILES[profile]}
+    if uses_msgpack(profile) and find_spec("msgpack") is None:
+        log_warning(
+            f"The '{profile}' worker profile uses msgpack, which is not installed."
+            " Falling back to JSON (install it with `pip install msgpack`)."
+        )
+        settings["task_serializer"] = "json"
+        settings["result_serializer"] = "json"
+        settings["accept_content"] = ["json"]
+    return settings
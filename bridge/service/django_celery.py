@@ -1,6 +1,10 @@
 import os
+from pathlib import Path
 
 from celery import Celery
+from celery.signals import worker_ready
+
+from bridge.utils.process import WORKER_READY_FILE_ENV_VAR
 
 if "DJANGO_SETTINGS_MODULE" not in os.environ:
     raise ValueError(
@@ -20,6 +24,13 @@ app.config_from_object("django.conf:settings", namespace="CELERY", force=True)
 app.autodiscover_tasks()
 
 
+@worker_ready.connect
+def mark_worker_ready(**kwargs):
+    ready_file = os.environ.get(WORKER_READY_FILE_ENV_VAR)
+    if ready_file:
+        Path(ready_file).write_text(str(os.getpid()))
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f"Request: {self.request!r}")
@@ -0,0 +1,106 @@
+"""
+A Django test runner which creates test databases from a migrated template.
+
+The template is built once for each set of migration files, and reused by later
+test runs (and by every database of a `--parallel` run) with
+`CREATE DATABASE ... TEMPLATE`, which is much faster than running migrations.
+
+Enable it with `postgres.template_test_databases: true` in bridge.yaml,
+or subclass BridgeTestRunner in your own TEST_RUNNER.
+"""
+
+import hashlib
+import sys
+from typing import Any
+
+import django
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.migrations.loader import MigrationLoader
+from django.test.runner import DiscoverRunner
+
+TEMPLATE_DATABASE_PREFIX = "bridge_template_"
+
+# Serializes template creation between concurrent test runs
+TEMPLATE_LOCK_ID = 0x62726964  # "brid"
+
+
+def migrations_hash() -> str:
+    """A hash of every migration file, which changes whenever the schema may have."""
+    digest = hashlib.sha256(django.get_version().encode())
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    for key in sorted(loader.disk_migrations):
+        module = sys.modules[loader.disk_migrations[key].__module__]
+        digest.update(repr(key).encode())
+        if module.__file__:
+            with open(module.__file__, "rb") as f:
+                digest.update(f.read())
+    # Apps without migrations have their tables created from their models directly
+    digest.update(repr(sorted(loader.unmigrated_apps)).encode())
+    return digest.hexdigest()[:16]
+
+
+def ensure_template_database(
+    connection: BaseDatabaseWrapper, verbosity: int = 1
+) -> str:
+    """Create the migrated template database for the current migrations, if needed."""
+    template_name = f"{TEMPLATE_DATABASE_PREFIX}{migrations_hash()}"
+    with connection._nodb_cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", [TEMPLATE_LOCK_ID])
+        try:
+            cursor.execute(
+                "SELECT 1 FROM pg_database WHERE datname = %s", [template_name]
+            )
+            if cursor.fetchone() is None:
+                drop_stale_templates(cursor, keep=template_name)
+                create_template_database(connection, template_name, verbosity)
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [TEMPLATE_LOCK_ID])
+    return template_name
+
+
+def drop_stale_templates(cursor: Any, keep: str) -> None:
+    cursor.execute(
+        "SELECT datname FROM pg_database WHERE datname LIKE %s AND datname != %s",
+        [f"{TEMPLATE_DATABASE_PREFIX}%", keep],
+    )
+    for (name,) in cursor.fetchall():
+        cursor.execute(f'DROP DATABASE IF EXISTS "{name}"')
+
+
+def create_template_database(
+    connection: BaseDatabaseWrapper, template_name: str, verbosity: int
+) -> None:
+    """Create and migrate the template like a test database, but keep it afterwards."""
+    from django.conf import settings
+
+    # create_test_db switches NAME to the database it creates, which is restored after
+    original_name = connection.settings_dict["NAME"]
+    test_settings = connection.settings_dict["TEST"]
+    original_test_settings = dict(test_settings)
+    test_settings["NAME"] = template_name
+    test_settings.pop("TEMPLATE", None)
+    try:
+        connection.creation.create_test_db(
+            verbosity=verbosity, autoclobber=True, serialize=False
+        )
+    finally:
+        test_settings.clear()
+        test_settings.update(original_test_settings)
+        # Disconnect, since a database can't be a template while it has connections
+        connection.close()
+        connection.settings_dict["NAME"] = original_name
+        settings.DATABASES[connection.alias]["NAME"] = original_name
+
+
+class BridgeTestRunner(DiscoverRunner):
+    def setup_databases(self, **kwargs: Any) -> Any:
+        # With --keepdb the test databases are already migrated
+        if not self.keepdb:
+            for alias in kwargs.get("aliases") or connections:
+                connection = connections[alias]
+                if connection.vendor != "postgresql":
+                    continue
+                template_name = ensure_template_database(connection, self.verbosity)
+                connection.settings_dict["TEST"]["TEMPLATE"] = template_name
+        return super().setup_databases(**kwargs)
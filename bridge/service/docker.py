@@ -1,15 +1,18 @@
+import hashlib
 import sys
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Generic, TypeVar, Union, cast
+from typing import TYPE_CHECKING, Any, Callable, Generic, Optional, TypeVar, Union, cast
 
 import docker
 from docker.models.containers import Container
 from pydantic import BaseModel, Field
-from rich.console import Console
 
-from bridge.console import log_error, log_task
-from bridge.utils.filesystem import resolve_dot_bridge
+from bridge.console import console, log_error, log_task, log_warning
+from bridge.service.images import record_image
+from bridge.service.readiness import ReadinessError, wait_until_ready
+from bridge.trace import span
 from bridge.utils.pydantic import Empty
+from bridge.utils.state import ContainerState, read_state, update_state
 
 if TYPE_CHECKING:
     import docker.errors
@@ -41,12 +44,58 @@ class ContainerConfig(BaseModel, Generic[T_BaseModel]):
     volumes: dict[str, Union[list[str], dict[str, str]]] = Field(default_factory=dict)
     restart_policy: dict[str, str] = {"Name": "always"}
     environment: T_BaseModel = Field(default_factory=Empty)
+    # Docker HEALTHCHECK, durations are in nanoseconds
+    healthcheck: Optional[dict[str, Any]] = None
+    # Overrides the image's default command
+    command: Optional[list[str]] = None
+    # Size of /dev/shm (e.g. "256m"), Docker's default is 64MB
+    shm_size: Optional[str] = None
+    # In-memory mounts, from container path to mount options (e.g. "rw,size=1g")
+    tmpfs: Optional[dict[str, str]] = None
+
+    def config_hash(self) -> str:
+        """A hash of this configuration, to detect containers created with another one."""
+        # Unset options are excluded, so adding new options doesn't change existing hashes
+        config_json = self.model_dump_json(exclude_none=True)
+        return hashlib.sha256(config_json.encode()).hexdigest()[:16]
+
+
+# Label recording the configuration a container was created with
+CONFIG_HASH_LABEL = "dev.bridge.config-hash"
+
+
+def seconds_to_nanoseconds(seconds: float) -> int:
+    return int(seconds * 1_000_000_000)
+
+
+def long_option(name: str, value: str) -> list[str]:
+    return [f"--{name}", value]
+
+
+def build_server_command(
+    executable: str,
+    settings: dict[str, str],
+    format_option: Callable[[str, str], list[str]] = long_option,
+) -> Optional[list[str]]:
+    """
+    The container command to start `executable` with `settings`,
+    or None for the image's default command.
+    """
+    if not settings:
+        return None
+    command = [executable]
+    for name, value in settings.items():
+        command.extend(format_option(name, value))
+    return command
 
 
 T_ContainerConfig = TypeVar("T_ContainerConfig", bound=ContainerConfig)
 
 
 class DockerService(ABC, Generic[T_ContainerConfig]):
+    # Maximum time to wait for the service to be ready after starting its container
+    READY_TIMEOUT: float = 60.0
+
     def __init__(self, client: docker.DockerClient, config: T_ContainerConfig) -> None:
         self.client = client
         self.config = config
@@ -54,7 +103,13 @@ class DockerService(ABC, Generic[T_ContainerConfig]):
         # todo add self.container - should we start or fetch the container on startup?
 
     def start(self):
-        console = Console()
+        if self.is_warm():
+            console.print(
+                f"[bold bright_green]Service [white]{self.config.name}[/white]"
+                " already running"
+            )
+            return
+
         console.print(
             f"[bold bright_green]Setting up service "
             f"[white]{self.config.name}[/white]..."
@@ -67,41 +122,165 @@ class DockerService(ABC, Generic[T_ContainerConfig]):
             f"[bold bright_green]Service [white]{self.config.name}[/white] started!"
         )
 
+    def is_warm(self) -> bool:
+        """
+        Check whether the container is already running and ready,
+        using the recorded container state and a single inspect call.
+        If the container is still running, and has not been restarted or
+        recreated since it was last verified ready, it does not need to be probed.
+        """
+        cached: Optional[ContainerState] = read_state().containers.get(self.config.name)
+        if (
+            cached is None
+            or cached.image != self.config.image
+            or cached.config_hash != self.config.config_hash()
+        ):
+            return False
+        try:
+            info = self.client.api.inspect_container(cached.container_id)
+        except docker.errors.NotFound:
+            return False
+
+        state = info["State"]
+        health = state.get("Health")
+        if (
+            not state["Running"]
+            or state["Paused"]
+            or state["Restarting"]
+            # Any restart since the last readiness check means we must check again
+            or state["StartedAt"] != cached.started_at
+            or info["Image"] != cached.image_id
+            or (health is not None and health["Status"] != "healthy")
+        ):
+            return False
+
+        self.container_id = cached.container_id
+        return True
+
     def register(self):
-        bridge_cid_path = resolve_dot_bridge() / "cid"
-        with open(bridge_cid_path, "a") as f:
-            f.write(f"{self.container_id}\n")
+        with span(f"{self.config.name}.register"):
+            self._register()
+
+    def _register(self):
+        # Record the verified-ready state, which allows a warm start next time
+        # and lets `bridge stop` find the container directly
+        info = self.client.api.inspect_container(self.container_id)
+        with update_state() as state:
+            state.containers[self.config.name] = ContainerState(
+                container_id=info["Id"],
+                image=self.config.image,
+                image_id=info["Image"],
+                ports=self.config.ports,
+                started_at=info["State"]["StartedAt"],
+                config_hash=self.config.config_hash(),
+            )
 
     def pull_image(self):
+        # Images recorded by an earlier start or `bridge pull` are not looked up again.
+        # If one was removed since, containers.run pulls it when creating the container.
+        if self.config.image in read_state().images:
+            return
         with log_task(
             start_message=f"Pulling [white]{self.config.image}",
             end_message=f"Image [white]{self.config.image}[/white] pulled",
+            span_name=f"{self.config.name}.pull_image",
         ):
-            if not self.client.images.list(name=self.config.image):
-                self.client.images.pull(self.config.image)
+            images = self.client.images.list(name=self.config.image)
+            image = images[0] if images else self.client.images.pull(self.config.image)
+            record_image(self.config.image, image)
 
     def start_container(self):
         with log_task(
             start_message=f"Starting container [white]{self.config.name}[/white]",
             end_message=f"Container [white]{self.config.name}[/white] started",
+            span_name=f"{self.config.name}.start_container",
         ):
             containers = self.client.containers.list(
                 filters={"name": self.config.name}, all=True
             )
+            container: Optional[Container] = None
             if containers:
                 # Container names are unique, there are 1 or 0 results
                 [model] = containers
                 container = cast(Container, model)
-                if container.status in ["paused", "exited"]:
+                if self._config_changed(container):
+                    # e.g. different server settings in bridge.yaml,
+                    # which only take effect in a new container
+                    log_warning(
+                        f"The configuration of {self.config.name} changed,"
+                        " recreating its container"
+                    )
+                    container.remove(force=True)
+                    container = None
+                elif container.status in ["paused", "exited"]:
                     container.restart()
-            else:
-                container = self.client.containers.run(
-                    **self.config.model_dump(),
-                    detach=True,
-                )
+            if container is None:
+                try:
+                    container = self.client.containers.run(
+                        **self.config.model_dump(),
+                        labels={CONFIG_HASH_LABEL: self.config.config_hash()},
+                        detach=True,
+                    )
+                except docker.errors.APIError as e:
+                    if e.status_code != 409:
+                        raise
+                    # Another process created the container after it was listed
+                    container = self.client.containers.get(self.config.name)
             container = cast(Container, container)
             self.container_id = container.id
 
-    @abstractmethod
+    def _config_changed(self, container: Container) -> bool:
+        config_hash = container.labels.get(CONFIG_HASH_LABEL)
+        if config_hash is None:
+            # Created before containers were labeled. Adopt it rather than losing its data,
+            # using the configuration recorded for it once it was ready (see _register)
+            cached = read_state().containers.get(self.config.name)
+            if cached is None or cached.container_id != container.id:
+                return False
+            config_hash = cached.config_hash or self.config.config_hash()
+        return config_hash != self.config.config_hash()
+
     def ensure_ready(self) -> None:
+        with log_task(
+            start_message=f"Waiting for [white]{self.config.name}[/white] to be ready",
+            end_message=f"[white]{self.config.name}[/white] is ready",
+            span_name=f"{self.config.name}.ensure_ready",
+        ):
+            try:
+                wait_until_ready(
+                    self._ready_or_failed,
+                    description=self.config.name,
+                    timeout=self.READY_TIMEOUT,
+                )
+            finally:
+                self.close()
+
+    def _ready_or_failed(self) -> bool:
+        try:
+            if self.check_ready():
+                return True
+        except Exception:
+            self.raise_if_failed()
+            raise
+        self.raise_if_failed()
+        return False
+
+    def raise_if_failed(self) -> None:
+        """Fail fast rather than waiting for a container which will never be ready."""
+        state = self.client.api.inspect_container(self.container_id)["State"]
+        if state["Status"] in ["exited", "dead"]:
+            raise ReadinessError(
+                f"Container {self.config.name} exited with code {state['ExitCode']}"
+            )
+        health = state.get("Health")
+        if health is not None and health["Status"] == "unhealthy":
+            raise ReadinessError(f"Container {self.config.name} is unhealthy")
+
+    @abstractmethod
+    def check_ready(self) -> bool:
+        """Attempt a single readiness probe against the running service."""
+        pass
+
+    def close(self) -> None:
+        """Release any resources held for readiness probes."""
         pass
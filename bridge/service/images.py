@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import docker
+from docker.models.images import Image
+from docker.utils import parse_repository_tag
+
+from bridge.console import get_console
+from bridge.utils.state import ImageState, update_state
+
+
+def with_variant(image: str, variant: Optional[str]) -> str:
+    """The tag of an image variant, e.g. postgres:12 -> postgres:12-alpine."""
+    if variant is None:
+        return image
+    return f"{image}-{variant}"
+
+
+def record_image(image: str, model: Image) -> None:
+    """Record a local image, so later starts don't need to look it up."""
+    repo_digests = model.attrs.get("RepoDigests") or []
+    with update_state() as state:
+        state.images[image] = ImageState(
+            image_id=model.id,
+            digest=repo_digests[0] if repo_digests else None,
+        )
+
+
+def pull_images(client: docker.DockerClient, images: list[str]) -> None:
+    """Pull `images` in parallel, showing the download progress of each."""
+    from rich.progress import (
+        BarColumn,
+        DownloadColumn,
+        Progress,
+        SpinnerColumn,
+        TextColumn,
+    )
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[white]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        console=get_console(),
+    ) as progress:
+
+        def pull(image: str) -> None:
+            task = progress.add_task(image, total=None)
+            # Downloaded and total bytes of each layer
+            layers: dict[str, tuple[int, int]] = {}
+            repository, tag = parse_repository_tag(image)
+            for event in client.api.pull(repository, tag=tag, stream=True, decode=True):
+                if "error" in event:
+                    raise docker.errors.APIError(
+                        f"Failed to pull {image}: {event['error']}"
+                    )
+                detail = event.get("progressDetail") or {}
+                if event.get("status") == "Downloading" and detail.get("total"):
+                    layers[event["id"]] = (detail.get("current", 0), detail["total"])
+                elif (
+                    event.get("status") == "Download complete" and event["id"] in layers
+                ):
+                    total = layers[event["id"]][1]
+                    layers[event["id"]] = (total, total)
+                else:
+                    continue
+                progress.update(
+                    task,
+                    completed=sum(current for current, _ in layers.values()),
+                    total=sum(total for _, total in layers.values()),
+                )
+            record_image(image, client.images.get(image))
+            # Every layer may already have been present, leaving nothing downloaded
+            pulled_bytes = sum(total for _, total in layers.values()) or 1
+            progress.update(task, completed=pulled_bytes, total=pulled_bytes)
+
+        with ThreadPoolExecutor(max_workers=max(len(images), 1)) as executor:
+            # Consume the results, which raises the first failure
+            list(executor.map(pull, images))
@@ -0,0 +1,157 @@
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Optional
+
+from pydantic import BaseModel, Field
+
+from bridge.console import log_error
+from bridge.trace import span
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+class ServiceStartupError(Exception): ...
+
+
+class ServiceNode(BaseModel):
+    """
+    A service in the startup graph.
+
+    `start` must start the service and block until it is ready,
+    since dependents are started as soon as it returns.
+    """
+
+    name: str
+    start: Callable[[], None]
+    depends_on: list[str] = Field(default_factory=list)
+
+
+class NodeResult(BaseModel):
+    name: str
+    # Seconds since the graph started running
+    started_at: float = 0.0
+    duration: float = 0.0
+    error: Optional[str] = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+class ServiceGraph:
+    """
+    Start services in dependency order, with as much parallelism as possible.
+
+    Each service starts as soon as all of the services it depends on are ready,
+    and is skipped if any of them failed to start.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, ServiceNode] = {}
+        self.results: dict[str, NodeResult] = {}
+
+    def add(
+        self,
+        name: str,
+        start: Callable[[], None],
+        depends_on: Optional[list[str]] = None,
+    ) -> None:
+        if name in self.nodes:
+            raise ValueError(f"Service '{name}' is already in the graph")
+        self.nodes[name] = ServiceNode(
+            name=name, start=start, depends_on=depends_on or []
+        )
+
+    def validate(self) -> None:
+        for node in self.nodes.values():
+            for dependency in node.depends_on:
+                if dependency not in self.nodes:
+                    raise ValueError(
+                        f"Service '{node.name}' depends on unknown service '{dependency}'"
+                    )
+        # Detect cycles, which would otherwise leave services waiting forever
+        resolved: set[str] = set()
+        remaining = dict(self.nodes)
+        while remaining:
+            ready = [
+                name
+                for name, node in remaining.items()
+                if set(node.depends_on) <= resolved
+            ]
+            if not ready:
+                raise ValueError(
+                    f"Cyclic dependencies between services: {', '.join(remaining)}"
+                )
+            resolved.update(ready)
+            for name in ready:
+                del remaining[name]
+
+    def run(self, parallel: bool = True) -> dict[str, NodeResult]:
+        """
+        Run the graph, raising ServiceStartupError if any service failed.
+        With parallel=False, services start one at a time in the order they were added.
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        self.validate()
+        self.results = {}
+        graph_start = perf_counter()
+
+        def run_node(node: ServiceNode) -> NodeResult:
+            result = NodeResult(name=node.name, started_at=perf_counter() - graph_start)
+            try:
+                with span(f"start:{node.name}"):
+                    node.start()
+            except Exception as e:
+                result.error = str(e) or type(e).__name__
+                raise
+            finally:
+                result.duration = perf_counter() - graph_start - result.started_at
+                self.results[node.name] = result
+            return result
+
+        pending = dict(self.nodes)
+        running: dict["Future", str] = {}
+        errors: dict[str, BaseException] = {}
+        max_workers = len(self.nodes) if parallel else 1
+        with ThreadPoolExecutor(
+            max_workers=max(max_workers, 1), thread_name_prefix="bridge"
+        ) as executor:
+            while pending or running:
+                for name, node in list(pending.items()):
+                    failed = [
+                        dependency
+                        for dependency in node.depends_on
+                        if dependency in self.results
+                        and not self.results[dependency].ok
+                    ]
+                    if failed:
+                        self.results[name] = NodeResult(name=name, skipped=True)
+                        del pending[name]
+                    elif all(
+                        dependency in self.results for dependency in node.depends_on
+                    ) and (parallel or not running):
+                        running[executor.submit(run_node, node)] = name
+                        del pending[name]
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        errors[name] = error
+
+        for name, error in errors.items():
+            log_error(f"Failed to start {name}: {error}")
+        skipped = [name for name, result in self.results.items() if result.skipped]
+        if skipped:
+            log_error(
+                f"Skipped {', '.join(skipped)}, since a service they depend on failed"
+            )
+        if errors:
+            raise ServiceStartupError(
+                f"Failed to start local services: {', '.join(errors)}"
+            ) from next(iter(errors.values()))
+        return self.results
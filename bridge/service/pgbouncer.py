@@ -0,0 +1,68 @@
+from typing import Optional
+
+import docker
+import psycopg
+from pydantic import BaseModel, Field
+
+from bridge.config import DatabaseConfig
+from bridge.platform.postgres import LOCAL_PGBOUNCER_PORT, PGBOUNCER_IMAGE
+from bridge.service.docker import ContainerConfig, DockerService
+
+
+class PgBouncerEnvironment(BaseModel):
+    # The local Postgres container, reached through the Docker host
+    DB_HOST: str = "host.docker.internal"
+    DB_PORT: str = "5432"
+    DB_USER: str = "postgres"
+    DB_PASSWORD: str = "postgres"
+    DB_NAME: str = "postgres"
+    # Connections are only held for the duration of a transaction
+    POOL_MODE: str = "transaction"
+    # Postgres 12 stores md5 password hashes by default
+    AUTH_TYPE: str = "md5"
+    MAX_CLIENT_CONN: str = "1000"
+    DEFAULT_POOL_SIZE: str = "20"
+
+
+class PgBouncerConfig(ContainerConfig[PgBouncerEnvironment]):
+    image: str = PGBOUNCER_IMAGE
+    name: str = "bridge_pgbouncer"
+    ports: dict[str, int] = {"5432/tcp": LOCAL_PGBOUNCER_PORT}
+    environment: PgBouncerEnvironment = Field(default_factory=PgBouncerEnvironment)
+    # Makes host.docker.internal resolve to the host on Linux, as it does elsewhere
+    extra_hosts: dict[str, str] = {"host.docker.internal": "host-gateway"}
+
+    @classmethod
+    def from_database_config(cls, database_config: DatabaseConfig) -> "PgBouncerConfig":
+        return cls(
+            environment=PgBouncerEnvironment(
+                DEFAULT_POOL_SIZE=str(database_config.pgbouncer_pool_size),
+                MAX_CLIENT_CONN=str(database_config.pgbouncer_max_client_conn),
+            )
+        )
+
+
+class PgBouncerService(DockerService[PgBouncerConfig]):
+    READY_TIMEOUT = 30.0
+
+    def __init__(
+        self, client: docker.DockerClient, config: Optional[PgBouncerConfig] = None
+    ) -> None:
+        super().__init__(client, config or PgBouncerConfig())
+
+    # NOTE: PgBouncerConfig has no Docker healthcheck,
+    # readiness is checked by connecting through PgBouncer instead.
+    def check_ready(self) -> bool:
+        environment = self.config.environment
+        dsn = (
+            f"dbname={environment.DB_NAME} "
+            f"user={environment.DB_USER} "
+            f"password={environment.DB_PASSWORD} "
+            f"host=localhost "
+            f"port={LOCAL_PGBOUNCER_PORT} "
+            "connect_timeout=2"
+        )
+        # Prepared statements don't survive transaction pooling
+        with psycopg.connect(dsn, prepare_threshold=None) as conn, conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        return True
@@ -1,15 +1,23 @@
 import os
-from time import sleep
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
 import docker
 import psycopg
 from pydantic import BaseModel, Field
 
-from bridge.console import log_task
-from bridge.service.docker import ContainerConfig, DockerService
+from bridge.config import DEV_FAST_POSTGRES_SETTINGS, DatabaseConfig
+from bridge.platform.postgres import LOCAL_TEST_POSTGRES_PORT
+from bridge.service.docker import (
+    ContainerConfig,
+    DockerService,
+    build_server_command,
+    seconds_to_nanoseconds,
+)
+from bridge.service.images import with_variant
 from bridge.utils.filesystem import resolve_dot_bridge
 
+POSTGRES_IMAGE = "postgres:12"
+
 
 class PostgresEnvironment(BaseModel):
     POSTGRES_USER: str = "postgres"
@@ -20,7 +28,7 @@ class PostgresEnvironment(BaseModel):
 
 
 class PostgresConfig(ContainerConfig[PostgresEnvironment]):
-    image: str = "postgres:12"
+    image: str = POSTGRES_IMAGE
     name: str = "bridge_postgres"
     ports: dict[str, int] = {"5432/tcp": 5432}
     volumes: dict[str, Union[list[str], dict[str, str]]] = Field(
@@ -32,6 +40,57 @@ class PostgresConfig(ContainerConfig[PostgresEnvironment]):
         }
     )
     environment: PostgresEnvironment = Field(default_factory=PostgresEnvironment)
+    healthcheck: Optional[dict[str, Any]] = Field(
+        default_factory=lambda: {
+            "test": ["CMD-SHELL", "pg_isready -U postgres"],
+            "interval": seconds_to_nanoseconds(5),
+            "timeout": seconds_to_nanoseconds(3),
+            "retries": 5,
+            "start_period": seconds_to_nanoseconds(60),
+        }
+    )
+
+    @classmethod
+    def from_database_config(
+        cls, database_config: DatabaseConfig, image_variant: Optional[str] = None
+    ) -> "PostgresConfig":
+        # NOTE: everything which starts the container must build its config here,
+        # since a container created with a different config is recreated
+        server_config = database_config.server
+        return cls(
+            image=with_variant(POSTGRES_IMAGE, image_variant),
+            command=build_postgres_command(server_config.server_settings()),
+            shm_size=server_config.shm_size,
+        )
+
+    @classmethod
+    def for_tests(
+        cls, database_config: DatabaseConfig, image_variant: Optional[str] = None
+    ) -> "PostgresConfig":
+        """
+        A separate, throwaway server for test runs. Its data directory is on tmpfs
+        and durability is turned off, so creating test databases is much faster.
+        """
+        server_config = database_config.server
+        settings = {**DEV_FAST_POSTGRES_SETTINGS, **server_config.server_settings()}
+        return cls(
+            image=with_variant(POSTGRES_IMAGE, image_variant),
+            name="bridge_postgres_test",
+            ports={"5432/tcp": LOCAL_TEST_POSTGRES_PORT},
+            volumes={},
+            tmpfs={
+                "/var/lib/postgresql/data": f"rw,size={database_config.test_server_tmpfs_size}"
+            },
+            command=build_postgres_command(settings),
+            shm_size=server_config.shm_size,
+        )
+
+
+def build_postgres_command(settings: dict[str, str]) -> Optional[list[str]]:
+    # Postgres only accepts long options as --name=value, so use -c
+    return build_server_command(
+        "postgres", settings, lambda name, value: ["-c", f"{name}={value}"]
+    )
 
 
 class PostgresService(DockerService[PostgresConfig]):
@@ -40,25 +99,19 @@ class PostgresService(DockerService[PostgresConfig]):
     ) -> None:
         super().__init__(client, config or PostgresConfig())
 
-    def ensure_ready(self):
+    def check_ready(self) -> bool:
         dsn = (
             f"dbname={self.config.environment.POSTGRES_DB} "
             f"user={self.config.environment.POSTGRES_USER} "
             f"password={self.config.environment.POSTGRES_PASSWORD} "
             f"host={self.config.environment.POSTGRES_HOST} "
-            f"port={self.config.environment.POSTGRES_PORT}"
+            # The port published on the host, which differs for the test server
+            f"port={self.config.ports['5432/tcp']} "
+            "connect_timeout=2"
         )
-        with log_task(
-            start_message=f"Waiting for [white]{self.config.name}[/white] to be ready",
-            end_message=f"[white]{self.config.name}[/white] is ready",
-        ):
-            while True:
-                try:
-                    with psycopg.connect(dsn) as conn, conn.cursor() as cur:
-                        cur.execute("SELECT 1")
-                        return
-                except psycopg.OperationalError:
-                    sleep(0.1)
+        with psycopg.connect(dsn) as conn, conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        return True
 
     def shell(self):
         # Open a shell to the Postgres container
@@ -0,0 +1,47 @@
+from time import monotonic, sleep
+from typing import Callable, Optional
+
+
+class ReadinessError(Exception): ...
+
+
+class ReadinessTimeoutError(ReadinessError): ...
+
+
+def wait_until_ready(
+    check: Callable[[], bool],
+    description: str,
+    timeout: float = 60.0,
+    initial_delay: float = 0.02,
+    max_delay: float = 0.1,
+    backoff: float = 2.0,
+) -> None:
+    """
+    Wait until `check` returns True, backing off exponentially between attempts.
+
+    The first attempt happens immediately, so an already-ready service returns
+    without sleeping. `check` may raise a ReadinessError to fail immediately,
+    e.g. when the service has crashed and will never become ready.
+    Raises ReadinessTimeoutError if the service is not ready within `timeout` seconds.
+    """
+    deadline = monotonic() + timeout
+    delay = initial_delay
+    last_error: Optional[Exception] = None
+    while True:
+        try:
+            if check():
+                return
+        except ReadinessError:
+            raise
+        except Exception as e:
+            # Transient errors (e.g. connection refused) are expected while starting
+            last_error = e
+
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            message = f"{description} was not ready after {timeout:g}s"
+            if last_error is not None:
+                message += f" (last error: {last_error})"
+            raise ReadinessTimeoutError(message) from last_error
+        sleep(min(delay, remaining))
+        delay = min(delay * backoff, max_delay)
@@ -1,46 +1,93 @@
 import os
-from time import sleep
-from typing import Optional
+from typing import Any, Optional, Union
 
 import docker
 import redis
+from pydantic import Field
 
-from bridge.console import log_task
-from bridge.platform.redis import RedisEnvironment
-from bridge.service.docker import ContainerConfig, DockerService
+from bridge.config import RedisServerConfig
+from bridge.platform import Platform
+from bridge.platform.redis import RedisRole, build_redis_environment
+from bridge.service.docker import (
+    ContainerConfig,
+    DockerService,
+    build_server_command,
+    seconds_to_nanoseconds,
+)
+from bridge.service.images import with_variant
+from bridge.utils.filesystem import resolve_dot_bridge
+
+REDIS_IMAGE = "redis:7.2.4"
 
 
 class RedisConfig(ContainerConfig):
-    image: str = "redis:7.2.4"
+    image: str = REDIS_IMAGE
     name: str = "bridge_redis"
     ports: dict[str, int] = {"6379/tcp": 6379}
+    healthcheck: Optional[dict[str, Any]] = Field(
+        default_factory=lambda: {
+            "test": ["CMD", "redis-cli", "ping"],
+            "interval": seconds_to_nanoseconds(5),
+            "timeout": seconds_to_nanoseconds(3),
+            "retries": 5,
+            "start_period": seconds_to_nanoseconds(30),
+        }
+    )
+
+    @classmethod
+    def from_server_config(
+        cls, server_config: RedisServerConfig, image_variant: Optional[str] = None
+    ) -> "RedisConfig":
+        volumes: dict[str, Union[list[str], dict[str, str]]] = {}
+        if server_config.persist:
+            data_path = resolve_dot_bridge() / "redisdata"
+            # Otherwise Docker creates the bind mount's source, owned by root
+            data_path.mkdir(exist_ok=True)
+            volumes[str(data_path)] = {
+                "bind": "/data",
+                "mode": "rw",
+            }
+        return cls(
+            image=with_variant(REDIS_IMAGE, image_variant),
+            command=build_server_command(
+                "redis-server", server_config.server_settings()
+            ),
+            volumes=volumes,
+        )
 
 
 class RedisService(DockerService[RedisConfig]):
+    READY_TIMEOUT = 30.0
+
     def __init__(
         self, client: docker.DockerClient, config: Optional[RedisConfig] = None
     ) -> None:
         super().__init__(client, config or RedisConfig())
-        self.redis_client_environment = RedisEnvironment()
-
-    def ensure_ready(self):
-        with log_task(
-            start_message=f"Waiting for [white]{self.config.name}[/white] to be ready",
-            end_message=f"[white]{self.config.name}[/white] is ready",
-        ):
-            while True:
-                try:
-                    # Attempt to create a connection to Redis
-                    r = redis.Redis(
-                        host=self.redis_client_environment.host,
-                        port=self.redis_client_environment.port,
-                    )
-                    if r.ping():
-                        return  # Redis is ready and responding
-                except redis.ConnectionError:
-                    sleep(0.1)
-
-    def shell(self):
-        # Open a shell to the Redis container
+        self.redis_client_environment = build_redis_environment(Platform.LOCAL)
+        self.redis_client: Optional[redis.Redis] = None
+
+    def check_ready(self) -> bool:
+        if self.redis_client is None:
+            # Reuse a single client (and its connection pool) across attempts
+            self.redis_client = redis.Redis(
+                host=self.redis_client_environment.host,
+                port=self.redis_client_environment.port,
+                db=self.redis_client_environment.role_db("broker"),
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+        return bool(self.redis_client.ping())
+
+    def close(self) -> None:
+        if self.redis_client is not None:
+            self.redis_client.close()
+            self.redis_client = None
+
+    def shell(self, role: RedisRole = "broker"):
+        # Open a shell to the Redis container, in the logical database for `role`
         # NOTE: This entirely replaces the currently running process!
-        os.execvp("docker", ["docker", "exec", "-it", self.config.name, "redis-cli"])
+        db = self.redis_client_environment.role_db(role)
+        os.execvp(
+            "docker",
+            ["docker", "exec", "-it", self.config.name, "redis-cli", "-n", str(db)],
+        )
@@ -0,0 +1,91 @@
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+from typing import Iterator
+
+from pydantic import BaseModel
+
+# Set BRIDGE_TRACE=1 (or `trace: true` in bridge.yaml) to record startup spans
+TRACE_ENV_VAR = "BRIDGE_TRACE"
+
+
+class Span(BaseModel):
+    name: str
+    # Seconds since tracing started
+    start: float
+    duration: float
+    thread: str
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.enabled = os.environ.get(TRACE_ENV_VAR, "").lower() in ["1", "true"]
+        self.origin = perf_counter()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            span = Span(
+                name=name,
+                start=start - self.origin,
+                duration=perf_counter() - start,
+                thread=threading.current_thread().name,
+            )
+            with self._lock:
+                self.spans.append(span)
+
+    def write_json(self, path: Path) -> None:
+        with path.open(mode="w") as f:
+            json.dump([span.model_dump() for span in self.spans], f, indent=2)
+
+    def print_summary(self) -> None:
+        from rich.table import Table
+
+        from bridge.console import get_console
+
+        table = Table(title="Bridge startup trace", title_justify="left")
+        table.add_column("Span")
+        table.add_column("Start (ms)", justify="right")
+        table.add_column("Duration (ms)", justify="right")
+        table.add_column("Thread")
+        for span in sorted(self.spans, key=lambda span: span.start):
+            table.add_row(
+                span.name,
+                f"{span.start * 1000:.1f}",
+                f"{span.duration * 1000:.1f}",
+                span.thread,
+            )
+        get_console().print(table)
+
+
+tracer = Tracer()
+
+
+def enable_tracing() -> None:
+    tracer.enabled = True
+
+
+def is_tracing_enabled() -> bool:
+    return tracer.enabled
+
+
+def span(name: str):
+    """Record the wall-clock time of a block, when tracing is enabled."""
+    return tracer.span(name)
+
+
+def strip_markup(message: str) -> str:
+    """Remove rich markup tags (e.g. [white]) to use a log message as a span name."""
+    return re.sub(r"\[/?[a-z_ ]*\]", "", message)
@@ -34,7 +34,7 @@ def resolve_dot_bridge() -> Path:
                 with open(path, "w") as f:
                     f.write(file_content.strip())
             else:
-                os.makedirs(path)
+                os.makedirs(path, exist_ok=True)
 
     # Create .bridge
     bridge_path = os.path.join(project_dir, ".bridge")
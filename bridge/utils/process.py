@@ -0,0 +1,99 @@
+import os
+import signal
+import subprocess
+import threading
+from contextlib import suppress
+from typing import Optional
+
+from bridge.utils.state import ProcessState, read_state, update_state
+
+# Set for background processes, which must not start local services themselves
+# when they import settings, since the process which spawned them is doing so.
+BACKGROUND_PROCESS_ENV_VAR = "BRIDGE_BACKGROUND_PROCESS"
+
+# When set, the worker writes its pid to this file once it is ready to accept tasks,
+# which lets bridge wait for the worker without broadcasting pings over the broker.
+# Bridge removes any stale file before starting a new worker.
+WORKER_READY_FILE_ENV_VAR = "BRIDGE_WORKER_READY_FILE"
+
+
+def process_create_time(pid: int) -> Optional[float]:
+    import psutil
+
+    try:
+        return psutil.Process(pid).create_time()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+def is_recorded_process_running(process: ProcessState) -> bool:
+    import psutil
+
+    try:
+        current = psutil.Process(process.pid)
+        # Comparing creation times ensures a reused pid is never mistaken for our process.
+        # A process which exited but hasn't been reaped yet is a zombie, and isn't running.
+        return (
+            current.create_time() == process.create_time
+            and current.status() != psutil.STATUS_ZOMBIE
+        )
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+
+
+def spawn_background_process(
+    name: str, command: list[str], env: Optional[dict[str, str]] = None
+) -> ProcessState:
+    """Start a detached background process, and record it in the bridge state."""
+    proc = subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # Detach from the terminal, so the process outlives the current command.
+        # This also makes it the leader of a new process group, owned by bridge.
+        start_new_session=True,
+        env={
+            **(env if env is not None else os.environ),
+            BACKGROUND_PROCESS_ENV_VAR: "1",
+        },
+    )
+    # Reap the process when it exits while this one is still running (e.g. runserver),
+    # rather than leaving a zombie behind
+    threading.Thread(target=proc.wait, name=f"bridge-reap-{name}", daemon=True).start()
+    process = ProcessState(
+        pid=proc.pid,
+        create_time=process_create_time(proc.pid) or 0.0,
+        command=command,
+    )
+    with update_state() as state:
+        state.processes[name] = process
+    return process
+
+
+def stop_background_process(name: str, timeout: float = 10.0) -> None:
+    """
+    Stop a background process recorded in the bridge state, if it is running.
+
+    Background processes lead their own process group, so the whole group is
+    signalled (e.g. Celery's pool processes along with the worker itself).
+    If the process has not exited within `timeout` seconds, the group is killed.
+    """
+    process = read_state().processes.get(name)
+    if process is None:
+        return
+    if is_recorded_process_running(process):
+        import psutil
+
+        with suppress(ProcessLookupError):
+            os.killpg(process.pid, signal.SIGTERM)
+        try:
+            # Wait for the process to exit, so it releases any ports it has bound
+            psutil.Process(process.pid).wait(timeout=timeout)
+        except psutil.TimeoutExpired:
+            with suppress(ProcessLookupError):
+                os.killpg(process.pid, signal.SIGKILL)
+        except psutil.NoSuchProcess:
+            pass
+    with update_state() as state:
+        state.processes.pop(name, None)
@@ -0,0 +1,122 @@
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from bridge.utils.filesystem import resolve_dot_bridge
+
+
+class ContainerState(BaseModel):
+    """A container started by bridge, as of the last time it was verified ready."""
+
+    container_id: str
+    image: str
+    image_id: str
+    ports: dict[str, int] = Field(default_factory=dict)
+    # Docker's State.StartedAt, which changes whenever the container restarts
+    started_at: str
+    # ContainerConfig.config_hash() of the configuration the container was created with
+    config_hash: str = ""
+
+
+class ImageState(BaseModel):
+    """An image which bridge pulled or found locally."""
+
+    image_id: str
+    # The registry digest the tag resolved to, if the image came from a registry
+    digest: Optional[str] = None
+
+
+class ProcessState(BaseModel):
+    """A background process started by bridge (e.g. the Celery worker)."""
+
+    pid: int
+    # Process creation time, which guards against a reused pid
+    create_time: float
+    command: list[str] = Field(default_factory=list)
+
+
+class StackState(BaseModel):
+    """The local stack started by `bridge up`."""
+
+    # Unix time at which every service was up
+    started_at: float
+    # BridgeConfig.config_hash() of the configuration the stack was started with
+    config_hash: str
+
+
+class BridgeState(BaseModel):
+    containers: dict[str, ContainerState] = Field(default_factory=dict)
+    # Keyed by image reference, e.g. "postgres:12"
+    images: dict[str, ImageState] = Field(default_factory=dict)
+    processes: dict[str, ProcessState] = Field(default_factory=dict)
+    # The runserver autoreloader parent which bootstrapped local services
+    reloader_session: Optional[ProcessState] = None
+    stack: Optional[StackState] = None
+
+
+STATE_FILE = "state.json"
+LOCK_FILE = "state.lock"
+
+# Guards the state file between threads, the file lock guards it between processes
+_thread_lock = threading.Lock()
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock(lock_file: IO[str]) -> None:
+        # Locks the first byte, which works on an empty file too
+        lock_file.seek(0)
+        while True:
+            try:
+                # Retries for about 10 seconds before raising
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _unlock(lock_file: IO[str]) -> None:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(lock_file: IO[str]) -> None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+    def _unlock(lock_file: IO[str]) -> None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_state() -> BridgeState:
+    """
+    Read the current state without locking.
+    Writes replace the file atomically, so readers never see a partial write.
+    """
+    try:
+        with open(resolve_dot_bridge() / STATE_FILE) as f:
+            return BridgeState.model_validate_json(f.read())
+    except (OSError, ValidationError):
+        # Missing or corrupt state only means bridge has to rediscover services
+        return BridgeState()
+
+
+@contextmanager
+def update_state() -> Iterator[BridgeState]:
+    """Read, modify and atomically write the state while holding its lock."""
+    dot_bridge_path = resolve_dot_bridge()
+    with _thread_lock, open(dot_bridge_path / LOCK_FILE, "w") as lock_file:
+        _lock(lock_file)
+        try:
+            state = read_state()
+            yield state
+            tmp_path = dot_bridge_path / f"{STATE_FILE}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(state.model_dump_json(indent=2))
+            os.replace(tmp_path, dot_bridge_path / STATE_FILE)
+        finally:
+            _unlock(lock_file)
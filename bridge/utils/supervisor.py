@@ -0,0 +1,145 @@
+"""
+Run a command under supervision, restarting it with backoff if it exits unexpectedly,
+and capturing its output to a rotating log file.
+
+    python -m bridge.utils.supervisor --log-file .bridge/logs/worker.log -- celery ...
+
+The supervisor shares a process group with the command, so stopping the group
+(see bridge.utils.process.stop_background_process) stops both of them.
+"""
+
+import argparse
+import logging
+import signal
+import subprocess
+import sys
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Optional
+
+# A run lasting at least this long is considered healthy, and resets the backoff
+STABLE_RUN_SECONDS = 60.0
+
+# Exit code for a command which could not be started, as in a shell
+LAUNCH_FAILED_EXIT_CODE = 127
+
+
+def build_logger(log_file: Path, max_bytes: int, backup_count: int) -> logging.Logger:
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    logger = logging.getLogger(f"bridge.supervisor.{log_file.stem}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+class Supervisor:
+    def __init__(
+        self,
+        command: list[str],
+        logger: logging.Logger,
+        restart: bool = True,
+        backoff_initial: float = 1.0,
+        backoff_max: float = 30.0,
+    ) -> None:
+        self.command = command
+        self.logger = logger
+        self.restart = restart
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.child: Optional[subprocess.Popen] = None
+        # Set by stop(), which runs in a signal handler, so this is a plain flag, not a lock
+        self._stopping = False
+
+    def stop(self, signum: int = signal.SIGTERM) -> None:
+        """Stop supervising, and forward `signum` to the command if it is running."""
+        self._stopping = True
+        child = self.child
+        if child is not None and child.poll() is None:
+            child.send_signal(signum)
+
+    def run_once(self) -> int:
+        try:
+            self.child = subprocess.Popen(
+                self.command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+        except OSError as e:
+            # e.g. the command is not on PATH, which is handled like a crash
+            self.logger.info(f"[bridge] Failed to start: {e}")
+            return LAUNCH_FAILED_EXIT_CODE
+        assert self.child.stdout is not None
+        for line in iter(self.child.stdout.readline, b""):
+            self.logger.info(line.decode(errors="replace").rstrip("\n"))
+        return self.child.wait()
+
+    def _sleep(self, seconds: float) -> None:
+        # Sleep in short steps, so a stop request during the backoff is handled promptly
+        deadline = monotonic() + seconds
+        while not self._stopping and monotonic() < deadline:
+            sleep(min(0.1, max(deadline - monotonic(), 0)))
+
+    def run(self) -> int:
+        backoff = self.backoff_initial
+        returncode = 0
+        while not self._stopping:
+            self.logger.info(f"[bridge] Starting: {' '.join(self.command)}")
+            started = monotonic()
+            returncode = self.run_once()
+            if self._stopping:
+                self.logger.info(f"[bridge] Stopped (exit code {returncode})")
+                return returncode
+            if not self.restart:
+                self.logger.info(f"[bridge] Exited with code {returncode}")
+                return returncode
+            if monotonic() - started >= STABLE_RUN_SECONDS:
+                backoff = self.backoff_initial
+            self.logger.info(
+                f"[bridge] Exited with code {returncode}, restarting in {backoff:g}s"
+            )
+            self._sleep(backoff)
+            backoff = min(backoff * 2, self.backoff_max)
+        return returncode
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bridge.utils.supervisor")
+    parser.add_argument("--log-file", type=Path, required=True)
+    parser.add_argument("--log-max-bytes", type=int, default=10 * 1024 * 1024)
+    parser.add_argument("--log-backup-count", type=int, default=3)
+    parser.add_argument("--no-restart", dest="restart", action="store_false")
+    parser.add_argument("--backoff-initial", type=float, default=1.0)
+    parser.add_argument("--backoff-max", type=float, default=30.0)
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("a command to supervise is required")
+
+    logger = build_logger(args.log_file, args.log_max_bytes, args.log_backup_count)
+    supervisor = Supervisor(
+        command,
+        logger=logger,
+        restart=args.restart,
+        backoff_initial=args.backoff_initial,
+        backoff_max=args.backoff_max,
+    )
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(signum, lambda signum, _frame: supervisor.stop(signum))
+    try:
+        return supervisor.run()
+    except Exception:
+        # The supervisor's own output isn't captured, so record why it failed
+        logger.exception("[bridge] Supervisor failed")
+        raise
+
+
+if __name__ == "__main__":
+    sys.exit(main())
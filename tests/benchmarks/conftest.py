@@ -0,0 +1,54 @@
+import statistics
+from time import perf_counter
+from typing import Callable
+
+import pytest
+
+from benchmarks.fakes import (
+    FakeDockerClient,
+    FakeRedis,
+    fake_psycopg_connect,
+)
+
+
+class Benchmark:
+    """Time a function over several rounds, and compare the median to a budget."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.timings: list[float] = []
+
+    def __call__(
+        self,
+        fn: Callable[[], object],
+        budget: float,
+        rounds: int = 20,
+        setup: Callable[[], object] = lambda: None,
+    ) -> float:
+        for _ in range(rounds):
+            setup()
+            start = perf_counter()
+            fn()
+            self.timings.append(perf_counter() - start)
+        median = statistics.median(self.timings)
+        print(f"\n{self.name}: median {median * 1000:.2f}ms over {rounds} rounds")
+        assert (
+            median < budget
+        ), f"{self.name} took {median * 1000:.2f}ms, budget is {budget * 1000:.0f}ms"
+        return median
+
+
+@pytest.fixture
+def benchmark(request):
+    return Benchmark(request.node.name)
+
+
+@pytest.fixture
+def fake_docker_client():
+    return FakeDockerClient()
+
+
+@pytest.fixture
+def fake_endpoints(mocker):
+    mocker.patch("psycopg.connect", fake_psycopg_connect)
+    mocker.patch("redis.Redis", FakeRedis)
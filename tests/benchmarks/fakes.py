@@ -0,0 +1,150 @@
+"""
+In-process fakes for the docker SDK, psycopg and redis.
+
+These behave like a Docker daemon where pulls and container starts succeed
+immediately, so benchmarks measure bridge's own overhead rather than Docker's.
+"""
+
+from itertools import count
+from typing import Any, Optional
+
+_container_ids = count()
+
+
+class FakeContainer:
+    def __init__(
+        self, name: str, image: str, labels: Optional[dict[str, str]] = None
+    ) -> None:
+        self.id = f"container{next(_container_ids)}"
+        self.name = name
+        self.image = image
+        self.labels = labels or {}
+        self.status = "running"
+        self.started_at = "2024-01-01T00:00:00Z"
+
+    def restart(self) -> None:
+        self.status = "running"
+
+    def stop(self) -> None:
+        self.status = "exited"
+
+    @property
+    def attrs(self) -> dict[str, Any]:
+        running = self.status == "running"
+        return {
+            "Id": self.id,
+            "Name": f"/{self.name}",
+            "Image": f"sha256:{self.image}",
+            "State": {
+                "Status": self.status,
+                "Running": running,
+                "Paused": False,
+                "Restarting": False,
+                "ExitCode": 0,
+                "StartedAt": self.started_at,
+                "Health": {"Status": "healthy"},
+            },
+        }
+
+
+class FakeImage:
+    def __init__(self, name: str) -> None:
+        self.id = f"sha256:{name}"
+        self.attrs = {"RepoDigests": [f"{name}@sha256:digest"]}
+
+
+class FakeImages:
+    def __init__(self) -> None:
+        self.pulled: set[str] = set()
+
+    def list(self, name: Optional[str] = None) -> list[FakeImage]:
+        return [FakeImage(image) for image in self.pulled if name in (None, image)]
+
+    def pull(self, image: str) -> FakeImage:
+        self.pulled.add(image)
+        return FakeImage(image)
+
+
+class FakeContainers:
+    def __init__(self) -> None:
+        self.containers: dict[str, FakeContainer] = {}
+
+    def list(self, filters: Optional[dict[str, str]] = None, all: bool = False):
+        name = (filters or {}).get("name")
+        return [
+            container
+            for container in self.containers.values()
+            if name in (None, container.name) and (all or container.status == "running")
+        ]
+
+    def run(
+        self,
+        image: str,
+        name: str,
+        labels: Optional[dict[str, str]] = None,
+        detach: bool = False,
+        **kwargs: Any,
+    ):
+        container = FakeContainer(name=name, image=image, labels=labels)
+        self.containers[container.id] = container
+        return container
+
+    def get(self, container_id: str) -> FakeContainer:
+        import docker.errors
+
+        try:
+            return self.containers[container_id]
+        except KeyError as e:
+            raise docker.errors.NotFound(container_id) from e
+
+
+class FakeAPIClient:
+    def __init__(self, containers: FakeContainers) -> None:
+        self._containers = containers
+
+    def inspect_container(self, container_id: str) -> dict[str, Any]:
+        return self._containers.get(container_id).attrs
+
+
+class FakeDockerClient:
+    def __init__(self) -> None:
+        self.images = FakeImages()
+        self.containers = FakeContainers()
+        self.api = FakeAPIClient(self.containers)
+
+
+class FakeCursor:
+    def __enter__(self) -> "FakeCursor":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def execute(self, query: str) -> None:
+        pass
+
+
+class FakePostgresConnection:
+    def __enter__(self) -> "FakePostgresConnection":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor()
+
+
+def fake_psycopg_connect(dsn: str) -> FakePostgresConnection:
+    return FakePostgresConnection()
+
+
+class FakeRedis:
+    def __init__(self, **kwargs: Any) -> None:
+        pass
+
+    def ping(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,52 @@
+from typing import Any, Callable, Optional
+
+import pytest
+
+from bridge.config import BridgeConfig
+from bridge.framework.django import DjangoHandler
+
+
+@pytest.fixture
+def project_dir(tmp_path, monkeypatch):
+    (tmp_path / "manage.py").touch()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def mocked_django_celery(mocker):
+    # Importing the real Celery app requires a configured Django project
+    mocked_module = mocker.MagicMock()
+    mocker.patch.dict("sys.modules", {"bridge.service.django_celery": mocked_module})
+    return mocked_module
+
+
+@pytest.fixture
+def django_settings() -> dict[str, Any]:
+    """Minimal settings, which test modules override with their own fixture."""
+    return {
+        "DATABASES": {
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": "db.sqlite3",
+            }
+        },
+        "DEBUG": True,
+        "SECRET_KEY": "secret",
+    }
+
+
+@pytest.fixture
+def make_django_handler(
+    django_settings,
+) -> Callable[[Optional[dict[str, Any]]], DjangoHandler]:
+    """Build a DjangoHandler for `django_settings` with the given bridge.yaml data."""
+
+    def make(config: Optional[dict[str, Any]] = None) -> DjangoHandler:
+        return DjangoHandler(
+            project_name="test",
+            framework_locals=django_settings,
+            bridge_config=BridgeConfig.model_validate(config or {}),
+        )
+
+    return make
@@ -0,0 +1,41 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+import bridge.service
+
+
+@pytest.fixture
+def django_celery(mocker, monkeypatch, tmp_path):
+    """The Celery app module, imported with the real Django and discarded afterwards."""
+    # Celery's Django fixup needs the real package, which tests/django shadows
+    tests_dir = str(Path(__file__).parents[1])
+    mocker.patch.object(sys, "path", [path for path in sys.path if path != tests_dir])
+    mocker.patch.dict(sys.modules)
+    for name in list(sys.modules):
+        if name == "django" or name.startswith(("django.", "bridge.service.django_")):
+            del sys.modules[name]
+    (tmp_path / "celery_settings.py").write_text("SECRET_KEY = 'secret'\n")
+    monkeypatch.syspath_prepend(tmp_path)
+    monkeypatch.setenv("DJANGO_SETTINGS_MODULE", "celery_settings")
+    mocker.patch.object(bridge.service, "django_celery", None, create=True)
+    return importlib.import_module("bridge.service.django_celery")
+
+
+def test_mark_worker_ready(django_celery, monkeypatch, tmp_path):
+    ready_file = tmp_path / "worker_ready"
+    monkeypatch.setenv(django_celery.WORKER_READY_FILE_ENV_VAR, str(ready_file))
+    django_celery.mark_worker_ready()
+    assert ready_file.read_text() == str(os.getpid())
+
+
+def test_mark_worker_ready_without_ready_file(django_celery, monkeypatch, tmp_path):
+    monkeypatch.delenv(django_celery.WORKER_READY_FILE_ENV_VAR, raising=False)
+    working_dir = tmp_path / "project"
+    working_dir.mkdir()
+    monkeypatch.chdir(working_dir)
+    django_celery.mark_worker_ready()
+    assert list(working_dir.iterdir()) == []
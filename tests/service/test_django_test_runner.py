@@ -0,0 +1,156 @@
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def test_runner(mocker):
+    """The test runner module, imported with the real Django and a minimal project."""
+    # tests/django shadows the real package while tests run,
+    # so import it (and the runner) in isolation and discard them afterwards
+    tests_dir = str(Path(__file__).parents[1])
+    mocker.patch.object(sys, "path", [path for path in sys.path if path != tests_dir])
+    mocker.patch.dict(sys.modules)
+    for name in list(sys.modules):
+        if name == "django" or name.startswith(("django.", "bridge.service.django_")):
+            del sys.modules[name]
+
+    import django
+    from django.conf import settings
+
+    settings.configure(
+        DATABASES={
+            "default": {
+                "ENGINE": "django.db.backends.postgresql",
+                "NAME": "app",
+                "TEST": {"NAME": None},
+            }
+        },
+        INSTALLED_APPS=["django.contrib.contenttypes", "django.contrib.auth"],
+    )
+    django.setup()
+
+    import bridge.service.django_test_runner as test_runner
+
+    return test_runner
+
+
+class FakeCursor:
+    def __init__(self, databases: set[str]) -> None:
+        self.databases = databases
+        self.queries: list[str] = []
+        self.result: list[tuple[str]] = []
+
+    def execute(self, query: str, params: list = ()) -> None:
+        self.queries.append(query)
+        if query.startswith("SELECT 1 FROM pg_database"):
+            self.result = [(params[0],)] if params[0] in self.databases else []
+        elif query.startswith("SELECT datname"):
+            prefix = params[0].rstrip("%")
+            self.result = [
+                (name,)
+                for name in self.databases
+                if name.startswith(prefix) and name != params[1]
+            ]
+        elif query.startswith("DROP DATABASE"):
+            self.databases.discard(query.split('"')[1])
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return self.result
+
+
+class FakeCreation:
+    def __init__(self, connection: "FakeConnection") -> None:
+        self.connection = connection
+
+    def create_test_db(self, verbosity, autoclobber, serialize):
+        # Like Django, switch the connection to the test database
+        settings_dict = self.connection.settings_dict
+        name = settings_dict["TEST"]["NAME"] or f"test_{settings_dict['NAME']}"
+        self.connection.databases.add(name)
+        settings_dict["NAME"] = name
+        return name
+
+
+class FakeConnection:
+    vendor = "postgresql"
+    alias = "default"
+
+    def __init__(self, settings_dict, databases: set[str]) -> None:
+        self.settings_dict = settings_dict
+        self.databases = databases
+        self.cursor = FakeCursor(databases)
+        self.creation = FakeCreation(self)
+        self.close_count = 0
+
+    @contextmanager
+    def _nodb_cursor(self):
+        yield self.cursor
+
+    def close(self):
+        self.close_count += 1
+
+
+@pytest.fixture
+def connection(test_runner):
+    from django.conf import settings
+
+    return FakeConnection(settings.DATABASES["default"], databases={"app"})
+
+
+def test_migrations_hash(test_runner, mocker):
+    migrations_hash = test_runner.migrations_hash()
+    assert migrations_hash == test_runner.migrations_hash()
+    # Different Django versions may create different schemas
+    mocker.patch("django.get_version", return_value="0.0")
+    assert test_runner.migrations_hash() != migrations_hash
+
+
+def test_ensure_template_database(test_runner, connection, mocker):
+    from django.conf import settings
+
+    mocker.patch.object(test_runner, "migrations_hash", return_value="new")
+    connection.databases.add("bridge_template_old")
+
+    template_name = test_runner.ensure_template_database(connection, verbosity=0)
+    assert template_name == "bridge_template_new"
+    assert connection.databases == {"app", "bridge_template_new"}
+    assert connection.close_count == 1
+    # The connection still points at the project's database
+    assert connection.settings_dict["NAME"] == "app"
+    assert connection.settings_dict["TEST"]["NAME"] is None
+    assert settings.DATABASES["default"]["NAME"] == "app"
+    assert "SELECT pg_advisory_unlock(%s)" in connection.cursor.queries
+
+    # An existing template is reused
+    mocker.patch.object(connection.creation, "create_test_db")
+    test_runner.ensure_template_database(connection, verbosity=0)
+    connection.creation.create_test_db.assert_not_called()
+
+
+def test_setup_databases_uses_template(test_runner, connection, mocker):
+    mocker.patch.object(test_runner, "migrations_hash", return_value="abc")
+    mocker.patch.object(test_runner, "connections", {"default": connection})
+    mocked_setup = mocker.patch(
+        "django.test.runner.DiscoverRunner.setup_databases", return_value=[]
+    )
+
+    test_runner.BridgeTestRunner(verbosity=0).setup_databases(aliases={"default"})
+    mocked_setup.assert_called_once()
+    assert connection.settings_dict["NAME"] == "app"
+    assert connection.settings_dict["TEST"]["TEMPLATE"] == "bridge_template_abc"
+
+
+def test_setup_databases_with_keepdb(test_runner, connection, mocker):
+    mocker.patch.object(test_runner, "connections", {"default": connection})
+    mocker.patch("django.test.runner.DiscoverRunner.setup_databases", return_value=[])
+
+    test_runner.BridgeTestRunner(verbosity=0, keepdb=True).setup_databases(
+        aliases={"default"}
+    )
+    assert "TEMPLATE" not in connection.settings_dict["TEST"]
@@ -0,0 +1,156 @@
+import pytest
+
+from bridge.service.docker import CONFIG_HASH_LABEL, ContainerConfig, DockerService
+from bridge.service.readiness import ReadinessError
+from bridge.utils.state import read_state, update_state
+
+
+class FakeService(DockerService[ContainerConfig]):
+    def check_ready(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def container_info():
+    return {
+        "Id": "abc123",
+        "Image": "sha256:image",
+        "State": {
+            "Status": "running",
+            "Running": True,
+            "Paused": False,
+            "Restarting": False,
+            "StartedAt": "2024-01-01T00:00:00Z",
+        },
+    }
+
+
+@pytest.fixture
+def service(mocker, container_info):
+    client = mocker.MagicMock()
+    client.api.inspect_container.return_value = container_info
+    client.images.list.return_value = [
+        mocker.MagicMock(id="sha256:image", attrs={"RepoDigests": ["image@sha256:1"]})
+    ]
+    client.containers.list.return_value = []
+    client.containers.run.return_value.id = "abc123"
+    return FakeService(
+        client=client, config=ContainerConfig(image="image:1", name="bridge_fake")
+    )
+
+
+def test_cold_start_registers_container(project_dir, service):
+    service.start()
+    service.client.containers.run.assert_called_once()
+    container = read_state().containers["bridge_fake"]
+    assert container.container_id == "abc123"
+    assert container.image_id == "sha256:image"
+
+
+def test_warm_start_skips_docker_work(project_dir, service):
+    service.start()
+    service.client.reset_mock()
+
+    service.start()
+    service.client.images.list.assert_not_called()
+    service.client.containers.list.assert_not_called()
+    service.client.api.inspect_container.assert_called_once_with("abc123")
+    assert service.container_id == "abc123"
+
+
+def test_restarted_container_is_not_warm(project_dir, service, container_info):
+    service.start()
+    container_info["State"]["StartedAt"] = "2024-01-02T00:00:00Z"
+    assert not service.is_warm()
+
+
+def test_stopped_container_is_not_warm(project_dir, service, container_info):
+    service.start()
+    container_info["State"]["Running"] = False
+    assert not service.is_warm()
+
+
+def test_exited_container_fails_fast(project_dir, service, container_info, mocker):
+    container_info["State"].update(Status="exited", Running=False, ExitCode=1)
+    mocker.patch.object(service, "check_ready", side_effect=ConnectionError)
+    service.container_id = "abc123"
+    with pytest.raises(ReadinessError, match="exited with code 1"):
+        service.ensure_ready()
+
+
+def test_changed_config_recreates_container(project_dir, service, mocker):
+    service.start()
+    existing = mocker.MagicMock(
+        labels={CONFIG_HASH_LABEL: service.config.config_hash()}
+    )
+    service.client.containers.list.return_value = [existing]
+
+    # The same config reuses the container
+    service.start_container()
+    existing.remove.assert_not_called()
+
+    # A new config is not warm, and replaces the container
+    service.config = ContainerConfig(
+        image="image:1", name="bridge_fake", command=["serve", "--fast"]
+    )
+    assert not service.is_warm()
+    service.client.containers.run.reset_mock()
+    service.start_container()
+    existing.remove.assert_called_once_with(force=True)
+    assert service.client.containers.run.call_args.kwargs["labels"] == {
+        CONFIG_HASH_LABEL: service.config.config_hash()
+    }
+
+
+def test_unlabeled_container_is_adopted(project_dir, service, mocker):
+    # Created by a version of bridge which didn't label containers
+    existing = mocker.MagicMock(id="abc123", labels={}, status="running")
+    service.client.containers.list.return_value = [existing]
+    service.start()
+    existing.remove.assert_not_called()
+    service.client.containers.run.assert_not_called()
+    assert read_state().containers["bridge_fake"].config_hash == (
+        service.config.config_hash()
+    )
+
+    # Its recorded configuration stands in for the label once the config changes
+    service.config = ContainerConfig(
+        image="image:1", name="bridge_fake", command=["serve", "--fast"]
+    )
+    service.start_container()
+    existing.remove.assert_called_once_with(force=True)
+    service.client.containers.run.assert_called_once()
+
+
+def test_recorded_image_is_not_looked_up(project_dir, service):
+    service.start()
+    assert read_state().images["image:1"].digest == "image@sha256:1"
+
+    # Another container from the same image, e.g. after its config changed
+    service.client.reset_mock()
+    with update_state() as state:
+        state.containers.clear()
+    service.start()
+    service.client.images.list.assert_not_called()
+    service.client.containers.run.assert_called_once()
+
+
+def test_container_created_concurrently_is_reused(project_dir, service, mocker):
+    import docker.errors
+
+    # Another process (e.g. the worker importing settings) creates the container
+    # between listing containers and creating one
+    service.client.containers.run.side_effect = docker.errors.APIError(
+        "Conflict", response=mocker.MagicMock(status_code=409)
+    )
+    service.client.containers.get.return_value.id = "def456"
+    service.start_container()
+    service.client.containers.get.assert_called_once_with("bridge_fake")
+    assert service.container_id == "def456"
+
+    # Other errors are raised
+    service.client.containers.run.side_effect = docker.errors.APIError(
+        "Server error", response=mocker.MagicMock(status_code=500)
+    )
+    with pytest.raises(docker.errors.APIError):
+        service.start_container()
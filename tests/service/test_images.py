@@ -0,0 +1,56 @@
+import pytest
+
+from bridge.cli.pull import required_images
+from bridge.config import BridgeConfig
+from bridge.service.images import pull_images
+from bridge.utils.state import read_state
+
+
+def test_pull_images_records_digests(project_dir, mocker):
+    client = mocker.MagicMock()
+    client.api.pull.side_effect = lambda repository, tag, **kwargs: iter(
+        [
+            {"status": "Pulling fs layer", "id": "layer"},
+            {
+                "status": "Downloading",
+                "id": "layer",
+                "progressDetail": {"current": 50, "total": 100},
+            },
+            {"status": "Download complete", "id": "layer"},
+        ]
+    )
+    client.images.get.side_effect = lambda image: mocker.MagicMock(
+        id=f"sha256:{image}", attrs={"RepoDigests": [f"{image}@sha256:1"]}
+    )
+
+    pull_images(client, ["postgres:12", "redis:7.2.4"])
+
+    client.api.pull.assert_any_call("postgres", tag="12", stream=True, decode=True)
+    images = read_state().images
+    assert images["postgres:12"].digest == "postgres:12@sha256:1"
+    assert images["redis:7.2.4"].image_id == "sha256:redis:7.2.4"
+
+
+def test_pull_images_raises_errors(project_dir, mocker):
+    import docker.errors
+
+    client = mocker.MagicMock()
+    client.api.pull.return_value = iter([{"error": "manifest unknown"}])
+    with pytest.raises(docker.errors.APIError, match="manifest unknown"):
+        pull_images(client, ["postgres:12"])
+    assert read_state().images == {}
+
+
+def test_required_images(project_dir):
+    assert required_images(BridgeConfig()) == ["postgres:12", "redis:7.2.4"]
+    bridge_config = BridgeConfig.model_validate(
+        {
+            "enable_worker": False,
+            "image_variant": "alpine",
+            "postgres": {"pgbouncer": True},
+        }
+    )
+    assert required_images(bridge_config) == [
+        "postgres:12-alpine",
+        "edoburu/pgbouncer:v1.23.1-p3",
+    ]
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from bridge.service.orchestrator import ServiceGraph, ServiceStartupError
+
+
+def test_runs_independent_services_in_parallel():
+    # Both services must be running at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    graph = ServiceGraph()
+    graph.add("postgres", barrier.wait)
+    graph.add("redis", barrier.wait)
+    results = graph.run()
+    assert all(result.ok for result in results.values())
+
+
+def test_runs_dependents_after_dependencies():
+    started = []
+    graph = ServiceGraph()
+    graph.add("worker", lambda: started.append("worker"), depends_on=["redis"])
+    graph.add("redis", lambda: started.append("redis"))
+    graph.add("flower", lambda: started.append("flower"), depends_on=["redis"])
+    graph.run()
+    assert started[0] == "redis"
+    assert set(started) == {"redis", "worker", "flower"}
+
+
+def test_runs_serially_in_order():
+    started = []
+    graph = ServiceGraph()
+    for name in ["postgres", "redis", "worker"]:
+        graph.add(name, lambda name=name: started.append(name))
+    graph.run(parallel=False)
+    assert started == ["postgres", "redis", "worker"]
+
+
+def test_records_timings():
+    graph = ServiceGraph()
+    graph.add("redis", lambda: None)
+    graph.add("worker", lambda: None, depends_on=["redis"])
+    results = graph.run()
+    assert results["worker"].started_at >= results["redis"].started_at
+    assert results["redis"].duration >= 0
+
+
+def test_skips_dependents_of_failed_services():
+    def fail() -> None:
+        raise RuntimeError("redis failed")
+
+    started = []
+    graph = ServiceGraph()
+    graph.add("postgres", lambda: started.append("postgres"))
+    graph.add("redis", fail)
+    graph.add("worker", lambda: started.append("worker"), depends_on=["redis"])
+    with pytest.raises(ServiceStartupError, match="redis"):
+        graph.run()
+    assert started == ["postgres"]
+    assert graph.results["redis"].error == "redis failed"
+    assert graph.results["worker"].skipped
+
+
+def test_rejects_cycles():
+    graph = ServiceGraph()
+    graph.add("a", lambda: None, depends_on=["b"])
+    graph.add("b", lambda: None, depends_on=["a"])
+    with pytest.raises(ValueError, match="Cyclic"):
+        graph.run()
+
+
+def test_rejects_unknown_dependencies():
+    graph = ServiceGraph()
+    graph.add("worker", lambda: None, depends_on=["redis"])
+    with pytest.raises(ValueError, match="unknown service"):
+        graph.run()
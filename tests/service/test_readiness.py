@@ -0,0 +1,56 @@
+import pytest
+
+from bridge.service.readiness import (
+    ReadinessError,
+    ReadinessTimeoutError,
+    wait_until_ready,
+)
+
+
+def test_ready_immediately_does_not_sleep(mocker):
+    mocked_sleep = mocker.patch("bridge.service.readiness.sleep")
+    wait_until_ready(lambda: True, description="service")
+    mocked_sleep.assert_not_called()
+
+
+def test_backs_off_exponentially(mocker):
+    mocked_sleep = mocker.patch("bridge.service.readiness.sleep")
+    attempts = iter([False, False, False, True])
+    wait_until_ready(
+        lambda: next(attempts),
+        description="service",
+        initial_delay=0.1,
+        max_delay=0.3,
+    )
+    assert [call.args[0] for call in mocked_sleep.call_args_list] == [
+        0.1,
+        0.2,
+        0.3,
+    ]
+
+
+def test_default_delay_is_capped_low(mocker):
+    mocked_sleep = mocker.patch("bridge.service.readiness.sleep")
+    attempts = iter([False] * 10 + [True])
+    wait_until_ready(lambda: next(attempts), description="service")
+    # A service is noticed soon after it becomes ready, even after a slow start
+    assert max(call.args[0] for call in mocked_sleep.call_args_list) == 0.1
+
+
+def test_times_out_with_last_error():
+    def check() -> bool:
+        raise ConnectionRefusedError("connection refused")
+
+    with pytest.raises(ReadinessTimeoutError, match="connection refused"):
+        wait_until_ready(check, description="service", timeout=0.05)
+
+
+def test_readiness_error_fails_immediately(mocker):
+    mocked_sleep = mocker.patch("bridge.service.readiness.sleep")
+
+    def check() -> bool:
+        raise ReadinessError("container exited")
+
+    with pytest.raises(ReadinessError, match="container exited"):
+        wait_until_ready(check, description="service")
+    mocked_sleep.assert_not_called()
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from bridge.console import log_task
+from bridge.trace import Tracer, strip_markup, tracer
+
+
+@pytest.fixture
+def enabled_tracer(monkeypatch):
+    monkeypatch.setattr(tracer, "enabled", True)
+    monkeypatch.setattr(tracer, "spans", [])
+    return tracer
+
+
+def test_disabled_tracer_records_nothing():
+    disabled_tracer = Tracer()
+    disabled_tracer.enabled = False
+    with disabled_tracer.span("configure_postgres"):
+        pass
+    assert disabled_tracer.spans == []
+
+
+def test_tracer_records_spans(tmp_path):
+    enabled_tracer = Tracer()
+    enabled_tracer.enabled = True
+    with enabled_tracer.span("configure_postgres"):
+        pass
+    [span] = enabled_tracer.spans
+    assert span.name == "configure_postgres"
+    assert span.duration >= 0
+
+    enabled_tracer.write_json(tmp_path / "trace.json")
+    [data] = json.loads((tmp_path / "trace.json").read_text())
+    assert data["name"] == "configure_postgres"
+
+
+def test_log_task_records_span(enabled_tracer):
+    with log_task("Pulling [white]postgres:12", "Image pulled"):
+        pass
+    with log_task("Starting", "Started", span_name="bridge_postgres.start_container"):
+        pass
+    assert [span.name for span in enabled_tracer.spans] == [
+        "Pulling postgres:12",
+        "bridge_postgres.start_container",
+    ]
+
+
+def test_strip_markup():
+    assert strip_markup("[white]bridge_postgres[/white] is ready") == (
+        "bridge_postgres is ready"
+    )
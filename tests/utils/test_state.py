@@ -0,0 +1,166 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import psutil
+
+from bridge.utils.process import (
+    is_recorded_process_running,
+    spawn_background_process,
+    stop_background_process,
+)
+from bridge.utils.state import (
+    ContainerState,
+    ProcessState,
+    StackState,
+    read_state,
+    update_state,
+)
+
+
+def test_missing_state_is_empty(project_dir):
+    state = read_state()
+    assert state.containers == {}
+    assert state.processes == {}
+
+
+def test_corrupt_state_is_empty(project_dir):
+    (project_dir / ".bridge").mkdir()
+    (project_dir / ".bridge" / "state.json").write_text("{not json")
+    assert read_state().containers == {}
+
+
+def test_update_state(project_dir):
+    with update_state() as state:
+        state.containers["bridge_redis"] = ContainerState(
+            container_id="abc123",
+            image="redis:7.2.4",
+            image_id="sha256:image",
+            ports={"6379/tcp": 6379},
+            started_at="2024-01-01T00:00:00Z",
+        )
+    container = read_state().containers["bridge_redis"]
+    assert container.container_id == "abc123"
+    assert container.ports == {"6379/tcp": 6379}
+
+
+def test_concurrent_updates_are_not_lost(project_dir):
+    def record(name: str) -> None:
+        with update_state() as state:
+            state.containers[name] = ContainerState(
+                container_id=name, image="image", image_id="id", started_at=""
+            )
+
+    threads = [threading.Thread(target=record, args=(str(i),)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(read_state().containers) == 10
+
+
+def test_background_process_lifecycle(project_dir):
+    process = spawn_background_process("sleeper", ["sleep", "30"])
+    assert read_state().processes["sleeper"] == process
+    assert is_recorded_process_running(process)
+
+    stop_background_process("sleeper")
+    assert "sleeper" not in read_state().processes
+
+
+def test_stop_background_process_stops_process_group(project_dir):
+    # The shell leads the process group, and `sleep` runs as its child
+    process = spawn_background_process("group", ["sh", "-c", "sleep 30 & wait"])
+    shell = psutil.Process(process.pid)
+    for _ in range(100):
+        if shell.children():
+            break
+        time.sleep(0.01)
+    [child] = shell.children()
+
+    stop_background_process("group", timeout=5)
+    assert not is_recorded_process_running(process)
+    assert not child.is_running() or child.status() == psutil.STATUS_ZOMBIE
+
+
+def test_background_process_is_marked(project_dir):
+    from bridge.utils.process import BACKGROUND_PROCESS_ENV_VAR
+
+    output = project_dir / "env.txt"
+    spawn_background_process(
+        "env", ["sh", "-c", f"echo ${BACKGROUND_PROCESS_ENV_VAR} > {output}"]
+    )
+    for _ in range(100):
+        if output.exists() and output.read_text():
+            break
+        time.sleep(0.01)
+    assert output.read_text().strip() == "1"
+
+
+def test_exited_background_process_is_not_running(project_dir):
+    process = spawn_background_process("exits", ["true"])
+    for _ in range(100):
+        if not psutil.pid_exists(process.pid):
+            break
+        time.sleep(0.01)
+    # The process is reaped, rather than left as a zombie
+    assert not psutil.pid_exists(process.pid)
+    assert not is_recorded_process_running(process)
+
+
+def test_zombie_process_is_not_running(project_dir):
+    import subprocess
+
+    from bridge.utils.process import process_create_time
+    from bridge.utils.state import ProcessState
+
+    proc = subprocess.Popen(["true"])
+    try:
+        zombie = psutil.Process(proc.pid)
+        for _ in range(100):
+            if zombie.status() == psutil.STATUS_ZOMBIE:
+                break
+            time.sleep(0.01)
+        process = ProcessState(pid=proc.pid, create_time=process_create_time(proc.pid))
+        assert not is_recorded_process_running(process)
+    finally:
+        proc.wait()
+
+
+def test_stop_clears_stack_and_reloader_session(project_dir):
+    from bridge.cli.stop import stop
+
+    with update_state() as state:
+        state.stack = StackState(started_at=0.0, config_hash="abc")
+        state.reloader_session = ProcessState(pid=1, create_time=0.0)
+
+    stop()
+    state = read_state()
+    assert state.stack is None
+    assert state.reloader_session is None
+
+
+def test_update_state_locks_with_msvcrt_on_windows(project_dir):
+    # fcntl is unavailable on Windows, so fake the platform and its locking module
+    code = """
+import sys, types
+calls = []
+msvcrt = types.ModuleType("msvcrt")
+msvcrt.LK_LOCK, msvcrt.LK_UNLCK = 1, 0
+msvcrt.locking = lambda fd, mode, nbytes: calls.append(mode)
+import bridge
+sys.modules.update(msvcrt=msvcrt, fcntl=None)
+# Reimport only the state module as if on Windows, as the standard library can't be
+sys.modules.pop("bridge.utils.state", None)
+sys.platform = "win32"
+from bridge.utils.state import update_state
+with update_state():
+    pass
+assert calls == [1, 0], calls
+"""
+    repo_dir = Path(__file__).parents[2]
+    env = {**os.environ, "PYTHONPATH": str(repo_dir)}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
@@ -0,0 +1,91 @@
+import signal
+import sys
+import threading
+
+from bridge.utils.supervisor import LAUNCH_FAILED_EXIT_CODE, Supervisor, build_logger
+
+
+def python_command(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def test_output_is_captured_to_log_file(tmp_path):
+    log_file = tmp_path / "logs" / "worker.log"
+    supervisor = Supervisor(
+        python_command("print('hello from the worker')"),
+        logger=build_logger(log_file, max_bytes=0, backup_count=0),
+        restart=False,
+    )
+    assert supervisor.run() == 0
+    assert "hello from the worker" in log_file.read_text()
+
+
+def test_log_file_is_rotated(tmp_path):
+    log_file = tmp_path / "worker.log"
+    supervisor = Supervisor(
+        python_command("print('x' * 100)\nprint('y' * 100)"),
+        logger=build_logger(log_file, max_bytes=150, backup_count=1),
+        restart=False,
+    )
+    supervisor.run()
+    assert (tmp_path / "worker.log.1").exists()
+
+
+def test_missing_command_is_logged(tmp_path):
+    log_file = tmp_path / "worker.log"
+    supervisor = Supervisor(
+        ["bridge-command-which-does-not-exist"],
+        logger=build_logger(log_file, max_bytes=0, backup_count=0),
+        restart=False,
+    )
+    assert supervisor.run() == LAUNCH_FAILED_EXIT_CODE
+    assert "Failed to start" in log_file.read_text()
+
+
+def test_crashed_command_is_restarted_with_backoff(tmp_path, mocker):
+    counter = tmp_path / "runs"
+    # Fail twice, then succeed
+    code = (
+        "import pathlib, sys\n"
+        f"path = pathlib.Path({str(counter)!r})\n"
+        "runs = int(path.read_text()) if path.exists() else 0\n"
+        "path.write_text(str(runs + 1))\n"
+        "sys.exit(1 if runs < 2 else 0)\n"
+    )
+    supervisor = Supervisor(
+        python_command(code),
+        logger=build_logger(tmp_path / "worker.log", max_bytes=0, backup_count=0),
+        backoff_initial=0.01,
+        backoff_max=0.02,
+    )
+    sleeps = []
+    mocker.patch.object(supervisor, "_sleep", side_effect=sleeps.append)
+    # Stop once the command succeeds, rather than restarting it forever
+    original_run_once = supervisor.run_once
+
+    def run_once():
+        returncode = original_run_once()
+        if returncode == 0:
+            supervisor.stop()
+        return returncode
+
+    mocker.patch.object(supervisor, "run_once", side_effect=run_once)
+    assert supervisor.run() == 0
+    assert counter.read_text() == "3"
+    assert sleeps == [0.01, 0.02]
+
+
+def test_stop_forwards_signal_and_does_not_restart(tmp_path):
+    supervisor = Supervisor(
+        python_command("import time\nprint('started', flush=True)\ntime.sleep(30)"),
+        logger=build_logger(tmp_path / "worker.log", max_bytes=0, backup_count=0),
+    )
+    result = []
+    thread = threading.Thread(target=lambda: result.append(supervisor.run()))
+    thread.start()
+    while supervisor.child is None or not (tmp_path / "worker.log").read_text():
+        threading.Event().wait(0.01)
+    supervisor.stop(signal.SIGTERM)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert result == [-signal.SIGTERM]